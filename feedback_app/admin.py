@@ -2,7 +2,54 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Feedback # Make sure Feedback is also imported
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, Tombstone, OutboxEvent, ReviewCycle, Dossier
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    On Postgres, an unfiltered changelist of a large table shows the planner's
+    row estimate instead of running COUNT(*) over every row. Filtered lists,
+    small tables and other databases still get an exact count.
+    """
+    estimate_above = 100000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = self._estimate(self.object_list)
+            if estimate is not None and estimate > self.estimate_above:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            # Partitioned parents (see partitioning.py) carry no stats of their own; sum their partitions
+            cursor.execute("""
+                SELECT CASE WHEN c.relkind = 'p' THEN (
+                    SELECT sum(greatest(k.reltuples, 0)) FROM pg_inherits i JOIN pg_class k ON k.oid = i.inhrelid
+                    WHERE i.inhparent = c.oid
+                ) ELSE c.reltuples END
+                FROM pg_class c WHERE c.oid = %s::regclass
+            """, [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    # No second COUNT(*) over the whole table when a filter is applied
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
 
 # Custom Admin for CustomUser to display the role and manager fields
 class CustomUserAdmin(UserAdmin):
@@ -12,6 +59,10 @@ class CustomUserAdmin(UserAdmin):
     list_filter = UserAdmin.list_filter + ('role',)
     # Add 'role' and 'manager' to the fields that can be searched
     search_fields = UserAdmin.search_fields + ('role',)
+    list_select_related = ('manager',) # One query for the page, not one per row
+    autocomplete_fields = ('manager',) # Not a <select> of every manager
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     # Customize fieldsets to include 'role' and 'manager' in the user edit form
     fieldsets = UserAdmin.fieldsets + (
@@ -21,6 +72,90 @@ class CustomUserAdmin(UserAdmin):
 # Register your CustomUser model with the custom admin class
 admin.site.register(CustomUser, CustomUserAdmin)
 
-# Also register your Feedback model so you can view/manage feedback in the admin
-# (Optional, but highly recommended for debugging/management)
-admin.site.register(Feedback)
\ No newline at end of file
+
+@admin.register(Feedback)
+class FeedbackAdmin(ScalableAdmin):
+    list_display = ('id', 'manager', 'employee', 'sentiment', 'sentiment_source', 'is_acknowledged', 'comment_count', 'created_at')
+    list_select_related = ('manager', 'employee')
+    list_filter = ('sentiment', 'is_acknowledged')
+    search_fields = ('=manager__username', '=employee__username') # Exact matches use the username index
+    autocomplete_fields = ('manager', 'employee')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+    readonly_fields = ('comment_count', 'sentiment_source', 'created_at', 'updated_at')
+
+
+@admin.register(Comment)
+class CommentAdmin(ScalableAdmin):
+    list_display = ('id', 'feedback_id', 'author', 'is_markdown', 'created_at')
+    list_select_related = ('author',)
+    search_fields = ('=author__username',)
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('feedback',)
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+    readonly_fields = ('content_html', 'created_at', 'updated_at')
+
+
+@admin.register(FeedbackRequest)
+class FeedbackRequestAdmin(ScalableAdmin):
+    list_display = ('id', 'requester', 'target_manager', 'is_fulfilled', 'created_at')
+    list_select_related = ('requester', 'target_manager')
+    list_filter = ('is_fulfilled',)
+    search_fields = ('=requester__username', '=target_manager__username')
+    autocomplete_fields = ('requester', 'target_manager')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+
+
+@admin.register(PeerFeedback)
+class PeerFeedbackAdmin(ScalableAdmin):
+    list_display = ('id', 'giver', 'receiver', 'is_anonymous', 'created_at')
+    list_select_related = ('giver', 'receiver')
+    list_filter = ('is_anonymous',)
+    search_fields = ('=giver__username', '=receiver__username')
+    autocomplete_fields = ('giver', 'receiver')
+    date_hierarchy = 'created_at'
+    ordering = ('-created_at', '-id')
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(ScalableAdmin):
+    list_display = ('resource', 'object_id', 'visible_to', 'deleted_at')
+    list_filter = ('resource',)
+    readonly_fields = ('resource', 'object_id', 'visible_to', 'deleted_at')
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(ScalableAdmin):
+    list_display = ('id', 'topic', 'status', 'attempts', 'available_at', 'created_at', 'processed_at')
+    list_filter = ('status',)
+    search_fields = ('=topic',)
+    readonly_fields = ('topic', 'payload', 'attempts', 'last_error', 'created_at', 'processed_at')
+    actions = ['retry']
+
+    @admin.action(description="Retry selected events")
+    def retry(self, request, queryset):
+        retried = queryset.exclude(status='done').update(status='pending', attempts=0, available_at=timezone.now())
+        self.message_user(request, f"{retried} event(s) queued for retry.")
+
+
+@admin.register(ReviewCycle)
+class ReviewCycleAdmin(ScalableAdmin):
+    list_display = ('name', 'starts_at', 'ends_at', 'status', 'built_at')
+    list_select_related = ('created_by',)
+    list_filter = ('status',)
+    autocomplete_fields = ('created_by',)
+    readonly_fields = ('status', 'built_at')
+
+
+@admin.register(Dossier)
+class DossierAdmin(ScalableAdmin):
+    list_display = ('id', 'cycle', 'employee', 'built_at')
+    list_select_related = ('cycle', 'employee')
+    list_filter = ('cycle',)
+    search_fields = ('=employee__username',)
+    readonly_fields = ('cycle', 'employee', 'data', 'built_at')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('pdf') # Never needed to list or edit
@@ -0,0 +1,79 @@
+# D:\GrowthFlow\feedback_app\counters.py
+
+"""
+Denormalized counters kept on Feedback and CustomUser:
+
+- Feedback.comment_count
+- CustomUser.feedback_received_count, pending_ack_count (unacknowledged feedback
+  received) and open_request_count (unfulfilled feedback requests made)
+
+Signal handlers in signals.py apply deltas with F() expressions so concurrent
+writers never lose updates. `reconcile_counters` recomputes everything with
+set-based UPDATEs, for bulk loads or drift.
+"""
+
+from django.apps import apps as global_apps
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def _bump(model, pk, **deltas):
+    if pk is None:
+        return
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    if any(f.name == 'updated_at' for f in model._meta.concrete_fields):
+        changes['updated_at'] = timezone.now() # The serialized payload changed
+    model.objects.filter(pk=pk).update(**changes)
+
+
+def adjust_user(user_id, received=0, pending=0, open_requests=0):
+    _bump(
+        global_apps.get_model('feedback_app', 'CustomUser'), user_id,
+        feedback_received_count=received, pending_ack_count=pending, open_request_count=open_requests,
+    )
+
+
+def adjust_feedback(feedback_id, comments):
+    _bump(global_apps.get_model('feedback_app', 'Feedback'), feedback_id, comment_count=comments)
+
+
+def _count(queryset, group_by):
+    return Coalesce(Subquery(
+        queryset.filter(**{group_by: OuterRef('pk')}).order_by().values(group_by)
+                .annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def reconcile_counters(apps=global_apps):
+    """Recompute every counter from the source tables. Returns (feedback rows, user rows) updated."""
+    CustomUser = apps.get_model('feedback_app', 'CustomUser')
+    Feedback = apps.get_model('feedback_app', 'Feedback')
+    Comment = apps.get_model('feedback_app', 'Comment')
+    FeedbackRequest = apps.get_model('feedback_app', 'FeedbackRequest')
+
+    feedback_rows = Feedback.objects.update(comment_count=_count(Comment.objects.all(), 'feedback'))
+    user_rows = CustomUser.objects.update(
+        feedback_received_count=_count(Feedback.objects.all(), 'employee'),
+        pending_ack_count=_count(Feedback.objects.filter(is_acknowledged=False), 'employee'),
+        open_request_count=_count(FeedbackRequest.objects.filter(is_fulfilled=False), 'requester'),
+    )
+    return feedback_rows, user_rows
+
+
+def drifted_users(apps=global_apps):
+    """Users whose stored counters disagree with the source tables."""
+    CustomUser = apps.get_model('feedback_app', 'CustomUser')
+    Feedback = apps.get_model('feedback_app', 'Feedback')
+    FeedbackRequest = apps.get_model('feedback_app', 'FeedbackRequest')
+    return CustomUser.objects.annotate(
+        actual_received=_count(Feedback.objects.all(), 'employee'),
+        actual_pending=_count(Feedback.objects.filter(is_acknowledged=False), 'employee'),
+        actual_open=_count(FeedbackRequest.objects.filter(is_fulfilled=False), 'requester'),
+    ).filter(
+        ~Q(feedback_received_count=F('actual_received'))
+        | ~Q(pending_ack_count=F('actual_pending'))
+        | ~Q(open_request_count=F('actual_open'))
+    )
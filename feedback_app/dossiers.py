@@ -0,0 +1,170 @@
+# D:\GrowthFlow\feedback_app\dossiers.py
+
+"""
+Per-employee review dossiers, precomputed for a ReviewCycle.
+
+`build_cycle` walks every user with a manager in keyset-paged batches and, per
+batch, loads the cycle's feedback, their comments and peer feedback with three
+queries, then upserts one Dossier row per employee holding the JSON payload
+(and a PDF when ReportLab is installed). During the cycle the API serves those
+rows directly instead of recomputing from the live tables.
+
+Builds run from the outbox (`review_cycle.build`) or `manage.py build_review_cycle`.
+They are idempotent, so a rebuild simply overwrites the previous payloads; the
+cycle is marked `building` meanwhile, and the API hides its dossiers until the
+build completes.
+"""
+
+import io
+import textwrap
+from collections import defaultdict
+
+from django.utils import timezone
+
+from .models import CustomUser, Feedback, Comment, PeerFeedback, Dossier
+from .rendering import html_to_text
+
+try:
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+except ImportError:
+    canvas = None # Dossiers are still built, just without the PDF
+
+SENTIMENTS = ['Positive', 'Neutral', 'Needs Improvement']
+
+
+def _dossier_data(cycle, employee, feedback, comments, peer_feedback):
+    sentiment_counts = dict.fromkeys(SENTIMENTS, 0)
+    for item in feedback:
+        if item.sentiment in sentiment_counts:
+            sentiment_counts[item.sentiment] += 1
+    return {
+        'cycle': {
+            'id': cycle.id, 'name': cycle.name,
+            'starts_at': cycle.starts_at.isoformat(), 'ends_at': cycle.ends_at.isoformat(),
+        },
+        'employee': {
+            'id': employee.id, 'username': employee.username,
+            'manager': employee.manager.username if employee.manager else None,
+        },
+        'sentiment_counts': sentiment_counts,
+        'feedback': [
+            {
+                'id': item.id,
+                'manager': item.manager.username,
+                'created_at': item.created_at.isoformat(),
+                'sentiment': item.sentiment,
+                'is_acknowledged': item.is_acknowledged,
+                'strengths': item.strengths,
+                'areas_to_improve': item.areas_to_improve,
+                'comments': [
+                    {'author': c.author.username, 'created_at': c.created_at.isoformat(), 'content_html': c.content_html}
+                    for c in comments.get(item.id, ())
+                ],
+            }
+            for item in feedback
+        ],
+        'peer_feedback': [
+            {
+                'id': item.id,
+                # Same rule as PeerFeedbackSerializer: anonymous givers are never stored
+                'giver': 'Anonymous' if item.is_anonymous else item.giver.username,
+                'created_at': item.created_at.isoformat(),
+                'feedback_text': item.feedback_text,
+            }
+            for item in peer_feedback
+        ],
+    }
+
+
+def render_dossier_pdf(data):
+    """PDF bytes for a dossier payload, or None when ReportLab isn't installed."""
+    if not canvas:
+        return None
+    buffer = io.BytesIO()
+    p = canvas.Canvas(buffer, pagesize=letter)
+    width, height = letter
+    y_pos = height - 1 * inch
+
+    def line(text, indent=0):
+        nonlocal y_pos
+        for chunk in textwrap.wrap(text, 95 - indent * 4) or ['']:
+            if y_pos < 1 * inch:
+                p.showPage()
+                y_pos = height - 1 * inch
+            p.drawString((1 + indent * 0.3) * inch, y_pos, chunk)
+            y_pos -= 0.2 * inch
+
+    employee, cycle = data['employee'], data['cycle']
+    line(f"Review dossier: {employee['username']} ({cycle['name']})")
+    line(f"Period: {cycle['starts_at'][:10]} to {cycle['ends_at'][:10]}   Manager: {employee['manager'] or '-'}")
+    line("Sentiment: " + ", ".join(f"{name} {count}" for name, count in data['sentiment_counts'].items()))
+    for item in data['feedback']:
+        line('')
+        line(f"Feedback from {item['manager']} on {item['created_at'][:10]} ({item['sentiment'] or 'unlabelled'})")
+        line(f"Strengths: {item['strengths']}", indent=1)
+        line(f"Areas to improve: {item['areas_to_improve']}", indent=1)
+        for comment in item['comments']:
+            line(f"- {comment['author']} ({comment['created_at'][:10]}): {html_to_text(comment['content_html'])}", indent=2)
+    if data['peer_feedback']:
+        line('')
+        line("Peer feedback:")
+        for item in data['peer_feedback']:
+            line(f"- {item['giver']} ({item['created_at'][:10]}): {item['feedback_text']}", indent=1)
+    p.showPage()
+    p.save()
+    return buffer.getvalue()
+
+
+def _build_batch(cycle, employees, built_at):
+    ids = [employee.id for employee in employees]
+    window = {'created_at__gte': cycle.starts_at, 'created_at__lt': cycle.ends_at}
+
+    feedback_by_employee = defaultdict(list)
+    for item in Feedback.objects.filter(employee_id__in=ids, **window).select_related('manager').order_by('created_at'):
+        feedback_by_employee[item.employee_id].append(item)
+    comments_by_feedback = defaultdict(list)
+    feedback_ids = [item.id for items in feedback_by_employee.values() for item in items]
+    # Replies posted after the cycle closed aren't part of its review material
+    comments = Comment.objects.filter(feedback_id__in=feedback_ids, created_at__lt=cycle.ends_at)
+    for comment in comments.select_related('author').order_by('created_at'):
+        comments_by_feedback[comment.feedback_id].append(comment)
+    peer_by_employee = defaultdict(list)
+    for item in PeerFeedback.objects.filter(receiver_id__in=ids, **window).select_related('giver').order_by('created_at'):
+        peer_by_employee[item.receiver_id].append(item)
+
+    dossiers = []
+    for employee in employees:
+        data = _dossier_data(
+            cycle, employee, feedback_by_employee[employee.id], comments_by_feedback, peer_by_employee[employee.id],
+        )
+        dossiers.append(Dossier(cycle=cycle, employee=employee, data=data, pdf=render_dossier_pdf(data), built_at=built_at))
+    Dossier.objects.bulk_create(
+        dossiers, update_conflicts=True, unique_fields=['cycle', 'employee'], update_fields=['data', 'pdf', 'built_at'],
+    )
+    return len(dossiers)
+
+
+def build_cycle(cycle, batch_size=200):
+    """(Re)build every dossier for the cycle. Returns the number of dossiers written."""
+    built_at = timezone.now()
+    if cycle.status != 'building':
+        cycle.status = 'building'
+        cycle.save(update_fields=['status'])
+    employees = CustomUser.objects.filter(manager__isnull=False).select_related('manager').order_by('pk')
+    built = 0
+    last_pk = 0
+    while True:
+        batch = list(employees.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1].pk
+        built += _build_batch(cycle, batch, built_at)
+
+    # Employees who no longer report to anyone keep no stale dossier
+    cycle.dossiers.filter(built_at__lt=built_at).delete()
+    cycle.status = 'ready'
+    cycle.built_at = built_at
+    cycle.save(update_fields=['status', 'built_at'])
+    return built
@@ -0,0 +1,34 @@
+# D:\GrowthFlow\feedback_app\hashers.py
+
+"""
+Password hashers whose cost comes from settings (PASSWORD_PBKDF2_ITERATIONS,
+PASSWORD_ARGON2_*), so it can be tuned per deployment without a code change.
+
+They keep Django's algorithm names, so existing hashes still verify. When the
+configured cost or preferred hasher changes, Django's check_password() sees
+must_update() and re-hashes the password on the user's next successful login.
+"""
+
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', 0) or PBKDF2PasswordHasher.iterations
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    # Needs argon2-cffi; settings only prefer it when that is installed
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost) # KiB
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
@@ -0,0 +1,40 @@
+# D:\GrowthFlow\feedback_app\management\commands\archive_history.py
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils.dateparse import parse_date
+
+from feedback_app.partitioning import PARTITIONED_TABLES, archive_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = (
+        "Postgres only: fold partitions of closed review periods (ending on or before --before) into one cold "
+        "archive partition per table. Rows stay queryable; only whole partitions are moved. The tables are locked "
+        "exclusively while the folded partitions and the existing archive are copied into the new archive, so reads "
+        "and writes wait for the copy; run it off-hours."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', required=True, help="Cutoff date (YYYY-MM-DD), e.g. the start of the open review cycle.")
+        parser.add_argument('--tablespace', help="Tablespace for the archive partitions, e.g. on cheaper storage.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning needs PostgreSQL; this database is %s." % connection.vendor)
+        before = parse_date(options['before'])
+        if before is None:
+            raise CommandError("--before must be a date in YYYY-MM-DD format.")
+        cutoff = datetime.datetime.combine(before, datetime.time.min, tzinfo=datetime.timezone.utc)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                if not is_partitioned(cursor, table):
+                    raise CommandError(f"{table} isn't partitioned yet; run partition_history first.")
+                folded = archive_partitions(cursor, table, cutoff, options['tablespace'])
+                if folded:
+                    self.stdout.write(f"Archived {', '.join(folded)} into {table}_archive.")
+
+        self.stdout.write(self.style.SUCCESS("Archival complete."))
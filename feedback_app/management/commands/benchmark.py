@@ -0,0 +1,282 @@
+# D:\GrowthFlow\feedback_app\management\commands\benchmark.py
+
+import datetime
+import json
+import re
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.db.models import Q
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from feedback_app.dossiers import build_cycle
+from feedback_app.models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, ReviewCycle, Dossier
+
+re_queries = re.compile(r'desc="(\d+) queries"')
+THROWAWAY = '[benchmark]' # Marks rows the write scenarios create, so they can be removed afterwards
+
+UNTHROTTLED = {
+    name: {'capacity': 10 ** 9, 'period': 60, 'cost': 1} for name in ('default', 'summary', 'pdf')
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive every API endpoint plus token auth at fixed concurrency and report p50/p95/p99 latency "
+        "and queries per request. Write scenarios (create, PATCH, DELETE, acknowledge, mark-fulfilled) run "
+        "against throwaway rows made for the run and removed afterwards. Not covered: the superuser-only "
+        "CSV import and the notification stream. Runs in-process against the configured database (SQLite "
+        "or Postgres), or against a running server with --url. Seed data first with `manage.py seed_org`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--url', help="Base URL of a running server, e.g. http://localhost:8000. In-process when omitted.")
+        parser.add_argument('--manager', help="Username to benchmark as manager (default: busiest seeded manager).")
+        parser.add_argument('--employee', help="Username to benchmark as employee (default: one of the manager's reports).")
+        parser.add_argument('--password', default='benchpass123')
+        parser.add_argument('--endpoint', action='append', dest='only', help="Only run endpoints whose name contains this.")
+
+    def handle(self, *args, **options):
+        self.base_url = options['url']
+        self.total = options['requests']
+        manager, employee = self._pick_users(options)
+        feedback = Feedback.objects.filter(manager=manager, employee=employee).first()
+        if feedback is None:
+            raise CommandError("The chosen manager has not given the chosen employee any feedback; run seed_org first.")
+        feedback_request = FeedbackRequest.objects.filter(target_manager=manager).first()
+        peer_feedback = PeerFeedback.objects.filter(Q(giver=manager) | Q(receiver=manager)).first()
+        comment = Comment.objects.filter(feedback__manager=manager).first()
+
+        # In-process runs would otherwise be throttled and keep every query in connection.queries
+        with override_settings(THROTTLE_BUCKETS=UNTHROTTLED, DEBUG=False):
+            credentials = {'username': manager.username, 'password': options['password']}
+            status, body, _ = self._request('POST', '/api/token/', data=credentials)
+            if status != 200:
+                raise CommandError(f"Could not obtain a token for {manager.username}: HTTP {status}")
+            tokens = json.loads(body)
+            status, body, _ = self._request(
+                'POST', '/api/token/', data={'username': employee.username, 'password': options['password']}
+            )
+            employee_access = json.loads(body)['access'] if status == 200 else None
+
+            manager_access = tokens['access']
+            feedback_body = {'employee': employee.id, 'strengths': THROWAWAY, 'areas_to_improve': 'Benchmark write.'}
+            # Paths given as callables are lists of throwaway rows, created only if the endpoint is selected
+            endpoints = [
+                ('token obtain', 'POST', '/api/token/', None, credentials),
+                ('token refresh', 'POST', '/api/token/refresh/', None, {'refresh': tokens['refresh']}),
+                ('users list', 'GET', '/api/users/', manager_access, None),
+                ('users me', 'GET', '/api/users/me/', manager_access, None),
+                ('users employees', 'GET', '/api/users/employees/', manager_access, None),
+                ('feedback list (manager)', 'GET', '/api/feedback/', manager_access, None),
+                ('feedback list (employee)', 'GET', '/api/feedback/', employee_access, None),
+                ('feedback detail', 'GET', f'/api/feedback/{feedback.id}/', manager_access, None),
+                ('feedback comment thread', 'GET', f'/api/feedback/{feedback.id}/comments/', manager_access, None),
+                ('feedback manager-summary', 'GET', '/api/feedback/manager-summary/', manager_access, None),
+                ('feedback export-pdf', 'GET', f'/api/feedback/{feedback.id}/export-pdf/', manager_access, None),
+                ('feedback create', 'POST', '/api/feedback/', manager_access, feedback_body),
+                ('feedback update', 'PATCH', lambda: self._throwaway_feedback(manager, employee, 'feedback'),
+                 manager_access, {'areas_to_improve': 'Benchmark edit.'}),
+                ('feedback acknowledge', 'PATCH', lambda: self._throwaway_feedback(manager, employee, 'acknowledge'),
+                 employee_access, {'is_acknowledged': True}),
+                ('feedback delete', 'DELETE', lambda: self._throwaway_feedback(manager, employee, 'feedback'),
+                 manager_access, None),
+                ('comments list', 'GET', f'/api/comments/?feedback={feedback.id}', manager_access, None),
+                ('comments create', 'POST', '/api/comments/', manager_access, {'feedback': feedback.id, 'content': THROWAWAY}),
+                ('comments update', 'PATCH', lambda: self._throwaway_comments(feedback, manager),
+                 manager_access, {'content': f'{THROWAWAY} edited'}),
+                ('comments delete', 'DELETE', lambda: self._throwaway_comments(feedback, manager), manager_access, None),
+                ('feedback-requests list', 'GET', '/api/feedback-requests/', manager_access, None),
+                ('feedback-requests create', 'POST', '/api/feedback-requests/', employee_access,
+                 {'target_manager': manager.id, 'reason': THROWAWAY}),
+                ('feedback-requests update', 'PATCH', lambda: self._throwaway_requests(employee, manager, 'feedback-requests'),
+                 employee_access, {'reason': f'{THROWAWAY} edited'}),
+                ('feedback-requests fulfil', 'PATCH', lambda: self._throwaway_requests(employee, manager, 'mark-fulfilled'),
+                 manager_access, None),
+                ('feedback-requests delete', 'DELETE', lambda: self._throwaway_requests(employee, manager, 'feedback-requests'),
+                 employee_access, None),
+                ('peer-feedback list', 'GET', '/api/peer-feedback/', manager_access, None),
+                ('peer-feedback create', 'POST', '/api/peer-feedback/', manager_access,
+                 {'receiver': employee.id, 'feedback_text': THROWAWAY}),
+                ('peer-feedback update', 'PATCH', lambda: self._throwaway_peer_feedback(manager, employee),
+                 manager_access, {'feedback_text': f'{THROWAWAY} edited'}),
+                ('peer-feedback delete', 'DELETE', lambda: self._throwaway_peer_feedback(manager, employee),
+                 manager_access, None),
+                ('review-cycles list', 'GET', '/api/review-cycles/', manager_access, None),
+            ]
+            if comment is not None:
+                endpoints.append(('comments detail', 'GET', f'/api/comments/{comment.id}/', manager_access, None))
+            if feedback_request is not None:
+                endpoints.append(('feedback-requests detail', 'GET', f'/api/feedback-requests/{feedback_request.id}/',
+                                  manager_access, None))
+            if peer_feedback is not None:
+                endpoints.append(('peer-feedback detail', 'GET', f'/api/peer-feedback/{peer_feedback.id}/',
+                                  manager_access, None))
+            endpoints += [
+                ('review-cycles detail', 'GET', lambda: [f'/api/review-cycles/{self._dossier(employee).cycle_id}/'],
+                 manager_access, None),
+                ('dossiers list', 'GET', lambda: [f'/api/dossiers/?cycle={self._dossier(employee).cycle_id}'],
+                 employee_access, None),
+                ('dossiers detail', 'GET', lambda: [f'/api/dossiers/{self._dossier(employee).id}/'], employee_access, None),
+                ('dossiers pdf', 'GET', lambda: [f'/api/dossiers/{self._dossier(employee).id}/pdf/'], employee_access, None),
+            ]
+            if options['only']:
+                endpoints = [e for e in endpoints if any(term in e[0] for term in options['only'])]
+
+            self.stdout.write(
+                f"Benchmarking as {manager.username} / {employee.username}: "
+                f"{options['requests']} requests per endpoint, concurrency {options['concurrency']}"
+            )
+            self.stdout.write(f"{'endpoint':<28}{'n':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>10}")
+            try:
+                for name, method, path, access, data in endpoints:
+                    paths = path() if callable(path) else [path]
+                    concurrency = options['concurrency']
+                    if method != 'GET' and self.base_url is None and connection.vendor == 'sqlite':
+                        concurrency = 1 # SQLite fails concurrent write transactions with "database is locked"
+                    row = self._run(method, paths, access, data, options['requests'], concurrency)
+                    self.stdout.write(
+                        f"{name:<28}{row['n']:>6}{row['errors']:>8}{row['p50']:>10.1f}{row['p95']:>10.1f}"
+                        f"{row['p99']:>10.1f}{row['queries']:>10}"
+                    )
+            finally:
+                self._remove_throwaways()
+
+    # --- Throwaway rows for the write scenarios, one per request, removed after the run ---
+    # Created through the ORM one by one so counters, tombstones and outbox events stay consistent
+    def _throwaway_feedback(self, manager, employee, route):
+        rows = [
+            Feedback.objects.create(manager=manager, employee=employee, strengths=THROWAWAY, areas_to_improve='-')
+            for _ in range(self.total)
+        ]
+        suffix = 'acknowledge/' if route == 'acknowledge' else ''
+        return [f'/api/feedback/{row.id}/{suffix}' for row in rows]
+
+    def _throwaway_comments(self, feedback, author):
+        rows = [Comment.objects.create(feedback=feedback, author=author, content=THROWAWAY) for _ in range(self.total)]
+        return [f'/api/comments/{row.id}/' for row in rows]
+
+    def _throwaway_requests(self, requester, target_manager, route):
+        rows = [
+            FeedbackRequest.objects.create(requester=requester, target_manager=target_manager, reason=THROWAWAY)
+            for _ in range(self.total)
+        ]
+        suffix = 'mark-fulfilled/' if route == 'mark-fulfilled' else ''
+        return [f'/api/feedback-requests/{row.id}/{suffix}' for row in rows]
+
+    def _throwaway_peer_feedback(self, giver, receiver):
+        rows = [
+            PeerFeedback.objects.create(giver=giver, receiver=receiver, feedback_text=THROWAWAY)
+            for _ in range(self.total)
+        ]
+        return [f'/api/peer-feedback/{row.id}/' for row in rows]
+
+    def _dossier(self, employee):
+        if not hasattr(self, '_dossier_row'):
+            cycle = ReviewCycle.objects.filter(status='ready').order_by('-built_at').first()
+            if cycle is None:
+                self.stdout.write("No built review cycle; building a throwaway one covering the past year.")
+                now = timezone.now()
+                cycle = ReviewCycle.objects.create(name=THROWAWAY, starts_at=now - datetime.timedelta(days=365), ends_at=now)
+                build_cycle(cycle)
+            self._dossier_row = Dossier.objects.defer('pdf').get(cycle=cycle, employee=employee)
+        return self._dossier_row
+
+    def _remove_throwaways(self):
+        # Rows created by the write scenarios all carry the marker; Feedback deletes cascade to comments
+        Feedback.objects.filter(strengths__startswith=THROWAWAY).delete()
+        Comment.objects.filter(content__startswith=THROWAWAY).delete()
+        FeedbackRequest.objects.filter(reason__startswith=THROWAWAY).delete()
+        PeerFeedback.objects.filter(feedback_text__startswith=THROWAWAY).delete()
+        ReviewCycle.objects.filter(name=THROWAWAY).delete()
+
+    def _pick_users(self, options):
+        if options['manager']:
+            manager = CustomUser.objects.get(username=options['manager'])
+        else:
+            manager = CustomUser.objects.filter(role='manager', feedback_given__isnull=False).first()
+        if manager is None:
+            raise CommandError("No manager with feedback found; run `manage.py seed_org` first.")
+        if options['employee']:
+            employee = CustomUser.objects.get(username=options['employee'])
+        else:
+            employee = CustomUser.objects.filter(manager=manager, role='employee', feedback_received__manager=manager).first()
+        return manager, employee
+
+    def _request(self, method, path, access=None, data=None):
+        """Returns (status, body, queries); queries come from the Server-Timing header."""
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {access}'} if access else {}
+        body = json.dumps(data) if data is not None else None
+
+        if self.base_url is None:
+            client = self._local_client()
+            response = client.generic(method, path, body or '', content_type='application/json', **headers)
+            content = b''.join(response.streaming_content) if response.streaming else response.content
+            return response.status_code, content, response.get('Server-Timing', '')
+
+        request = urllib.request.Request(
+            self.base_url.rstrip('/') + path, method=method,
+            data=body.encode() if body else None,
+            headers={'Content-Type': 'application/json', **({'Authorization': f'Bearer {access}'} if access else {})},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.read(), response.headers.get('Server-Timing', '')
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read(), exc.headers.get('Server-Timing', '')
+
+    _local = threading.local()
+
+    def _local_client(self):
+        if not hasattr(self._local, 'client'):
+            self._local.client = Client()
+        return self._local.client
+
+    def _run(self, method, paths, access, data, total, concurrency):
+        latencies, queries = [], []
+        errors = defaultdict(int)
+
+        def one(i):
+            start = time.perf_counter()
+            try:
+                status, _, timing = self._request(method, paths[i % len(paths)], access, data)
+            except Exception: # In-process, server errors surface as exceptions; count them like a 500
+                status, timing = 500, ''
+            elapsed = (time.perf_counter() - start) * 1000
+            return status, elapsed, timing
+
+        def work(chunk):
+            try:
+                return [one(i) for i in chunk]
+            finally:
+                connections.close_all() # Each worker thread opens its own connection
+
+        chunks = [range(i, total, concurrency) for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for results in pool.map(work, chunks):
+                for status, elapsed, timing in results:
+                    if status >= 400:
+                        errors[status] += 1
+                        continue
+                    latencies.append(elapsed)
+                    match = re_queries.search(timing)
+                    if match:
+                        queries.append(int(match.group(1)))
+
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) >= 2 else [latencies[0] if latencies else 0.0] * 99
+        return {
+            'n': total,
+            'errors': sum(errors.values()),
+            'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98],
+            'queries': f'{statistics.mean(queries):.1f}' if queries else '-',
+        }
@@ -0,0 +1,102 @@
+# D:\GrowthFlow\feedback_app\management\commands\benchmark_login.py
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import override_settings
+
+from feedback_app.management.commands.benchmark import UNTHROTTLED, Command as BenchmarkCommand
+from feedback_app.models import CustomUser
+
+
+class Command(BenchmarkCommand):
+    help = (
+        "Benchmark the login pipeline: per-hasher cost of hashing and verifying a password, then a burst of "
+        "distinct users obtaining tokens (twice: the first pass includes any rehash-on-login) and refreshing "
+        "them. Runs in-process, or against a running server with --url. Seed users first with `manage.py seed_org`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=100, help="Distinct users in the login burst.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--url', help="Base URL of a running server. In-process when omitted.")
+        parser.add_argument('--prefix', default='seed', help="Username prefix of the seeded users.")
+        parser.add_argument('--password', default='benchpass123')
+        parser.add_argument('--samples', type=int, default=5, help="Hash/verify samples per hasher.")
+
+    def handle(self, *args, **options):
+        self.base_url = options['url']
+        self._hasher_costs(options['samples'])
+
+        usernames = list(
+            CustomUser.objects.filter(username__startswith=options['prefix'], is_active=True)
+                              .order_by('pk').values_list('username', flat=True)[:options['logins']]
+        )
+        if not usernames:
+            raise CommandError(f"No users named '{options['prefix']}...'; run `manage.py seed_org` first.")
+
+        with override_settings(THROTTLE_BUCKETS=UNTHROTTLED, DEBUG=False):
+            self.stdout.write(f"\nToken burst: {len(usernames)} users, concurrency {options['concurrency']}")
+            self.stdout.write(f"{'step':<28}{'n':>6}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+            payloads = [('/api/token/', {'username': name, 'password': options['password']}) for name in usernames]
+            self._burst('login (first, may rehash)', payloads, options['concurrency'])
+            bodies = self._burst('login (repeat)', payloads, options['concurrency'])
+            refreshes = [('/api/token/refresh/', {'refresh': json.loads(body)['refresh']}) for body in bodies if body]
+            self._burst('refresh', refreshes, options['concurrency'])
+
+    def _hasher_costs(self, samples):
+        self.stdout.write(f"{'hasher':<36}{'hash ms':>10}{'verify ms':>10}{'logins/s/core':>15}")
+        for hasher in get_hashers():
+            if hasher.library:
+                try:
+                    hasher._load_library()
+                except ValueError:
+                    self.stdout.write(f"{type(hasher).__name__:<36}{'(library not installed)':>35}")
+                    continue
+            hash_times, verify_times = [], []
+            for _ in range(samples):
+                start = time.perf_counter()
+                encoded = hasher.encode('benchmark-password', hasher.salt())
+                hash_times.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                hasher.verify('benchmark-password', encoded)
+                verify_times.append(time.perf_counter() - start)
+            verify_ms = statistics.median(verify_times) * 1000
+            self.stdout.write(
+                f"{type(hasher).__name__:<36}{statistics.median(hash_times) * 1000:>10.1f}{verify_ms:>10.1f}"
+                f"{1000 / verify_ms:>15.1f}"
+            )
+
+    def _burst(self, name, payloads, concurrency):
+        """POST every (path, data) pair at fixed concurrency; returns the response bodies (None on error)."""
+        def one(item):
+            path, data = item
+            start = time.perf_counter()
+            status, body, _ = self._request('POST', path, data=data)
+            return status, (time.perf_counter() - start) * 1000, body
+
+        def work(chunk):
+            try:
+                return [one(item) for item in chunk]
+            finally:
+                connections.close_all() # Each worker thread opens its own connection
+
+        started = time.perf_counter()
+        chunks = [payloads[i::concurrency] for i in range(concurrency)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = [result for chunk in pool.map(work, chunks) for result in chunk]
+        wall = time.perf_counter() - started
+
+        latencies = [elapsed for status, elapsed, _ in results if status < 400]
+        errors = len(results) - len(latencies)
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) >= 2 else [latencies[0] if latencies else 0.0] * 99
+        self.stdout.write(
+            f"{name:<28}{len(results):>6}{errors:>8}{cuts[49]:>10.1f}{cuts[94]:>10.1f}{cuts[98]:>10.1f}"
+            f"{len(results) / wall:>10.1f}"
+        )
+        return [body if status < 400 else None for status, _, body in results]
@@ -0,0 +1,21 @@
+# D:\GrowthFlow\feedback_app\management\commands\build_review_cycle.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app.dossiers import build_cycle
+from feedback_app.models import ReviewCycle
+
+
+class Command(BaseCommand):
+    help = "Build (or rebuild) the precomputed per-employee dossiers for a review cycle."
+
+    def add_arguments(self, parser):
+        parser.add_argument('cycle_id', type=int)
+        parser.add_argument('--batch-size', type=int, default=200, help="Employees per batch.")
+
+    def handle(self, *args, **options):
+        cycle = ReviewCycle.objects.filter(pk=options['cycle_id']).first()
+        if cycle is None:
+            raise CommandError(f"Review cycle {options['cycle_id']} does not exist.")
+        built = build_cycle(cycle, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Built {built} dossier(s) for {cycle}."))
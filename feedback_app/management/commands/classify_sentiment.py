@@ -0,0 +1,58 @@
+# D:\GrowthFlow\feedback_app\management\commands\classify_sentiment.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from feedback_app.models import Feedback
+from feedback_app.sentiment import classify_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Label Feedback.sentiment with the offline lexicon classifier, in keyset-paged batches. "
+        "Manager-entered labels are never overwritten. Use --watch to keep labelling new feedback."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--relabel', action='store_true', help="Also recompute labels the classifier set earlier.")
+        parser.add_argument('--watch', type=float, metavar='SECONDS', help="Poll for unlabelled feedback every SECONDS.")
+
+    def handle(self, *args, **options):
+        pending = Q(sentiment__isnull=True)
+        if options['relabel']:
+            pending |= Q(sentiment_source='classifier')
+
+        while True:
+            labelled = self.run_pass(pending, options['batch_size'])
+            if labelled or not options['watch']:
+                self.stdout.write(self.style.SUCCESS(f"Labelled {labelled} feedback row(s)."))
+            if not options['watch']:
+                return
+            pending = Q(sentiment__isnull=True) # Relabelling is a one-off; afterwards only new rows
+            time.sleep(options['watch'])
+
+    def run_pass(self, pending, batch_size):
+        labelled = 0
+        last_pk = 0
+        while True:
+            rows = list(
+                Feedback.objects.filter(pending, pk__gt=last_pk).order_by('pk')
+                        .values_list('pk', 'strengths', 'areas_to_improve')[:batch_size]
+            )
+            if not rows:
+                return labelled
+            last_pk = rows[-1][0]
+
+            by_label = {}
+            for pk, label in classify_batch(rows).items():
+                by_label.setdefault(label, []).append(pk)
+            now = timezone.now() # The serialized payload changes, so delta sync must see it
+            for label, pks in by_label.items():
+                # Re-check `pending` so a manager's label saved mid-batch wins
+                labelled += Feedback.objects.filter(pending, pk__in=pks).update(
+                    sentiment=label, sentiment_source='classifier', updated_at=now,
+                )
@@ -0,0 +1,36 @@
+# D:\GrowthFlow\feedback_app\management\commands\drain_outbox.py
+
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from feedback_app.outbox import drain, purge
+from feedback_app.signals import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Run side effects queued in the transactional outbox: claims due events in batches, runs their "
+        "handlers (optionally on several threads) and retries failures with backoff. Safe to run several copies. "
+        "Also purges delta-sync tombstones older than TOMBSTONE_RETENTION_DAYS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--concurrency', type=int, default=4, help="Handler threads per worker.")
+        parser.add_argument('--watch', type=float, metavar='SECONDS', help="Keep polling for new events every SECONDS.")
+        parser.add_argument('--keep-days', type=int, default=7, help="Delete processed events older than this.")
+
+    def handle(self, *args, **options):
+        while True:
+            succeeded, failed = drain(options['batch_size'], options['concurrency'])
+            purged = purge(datetime.timedelta(days=options['keep_days']))
+            tombstones = purge_tombstones()
+            if succeeded or failed or not options['watch']:
+                self.stdout.write(
+                    f"Processed {succeeded} event(s), {failed} failed, purged {purged} and {tombstones} tombstone(s)."
+                )
+            if not options['watch']:
+                return
+            time.sleep(options['watch'])
@@ -0,0 +1,39 @@
+# D:\GrowthFlow\feedback_app\management\commands\import_org.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feedback_app.org_import import ImportFileError, import_users, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users and manager links from a CSV file (username,email,first_name,last_name,role,manager,password). "
+        "Validates the whole file, including reporting cycles, before writing anything."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--workers', type=int, help="Password-hashing processes (default: CPU count).")
+        parser.add_argument('--dry-run', action='store_true', help="Only validate the file.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+                rows = read_rows(f)
+        except ImportFileError as e:
+            raise CommandError(str(e))
+        result = import_users(rows, options['batch_size'], options['workers'], options['dry_run'], processes=True)
+        if result.errors:
+            for error in result.errors[:50]:
+                self.stderr.write(error)
+            raise CommandError(f"{len(result.errors)} problem(s) found; nothing was imported.")
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f"{len(rows)} row(s) are valid."))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.created} user(s) in {time.perf_counter() - started:.1f}s."
+        ))
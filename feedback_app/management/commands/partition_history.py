@@ -0,0 +1,42 @@
+# D:\GrowthFlow\feedback_app\management\commands\partition_history.py
+
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from feedback_app.partitioning import PARTITIONED_TABLES, convert_to_partitioned, ensure_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = (
+        "Postgres only: range-partition Feedback, Comment and PeerFeedback by created_at (converting them on "
+        "first run) and create partitions ahead of time. Schedule it so new rows never land in the default partition. "
+        "The first run copies every row while holding an exclusive lock on each table, blocking all reads and writes "
+        "until it commits, and drops foreign keys into the tables (comment.feedback_id); run it in a maintenance "
+        "window. Later runs only lock briefly, unless rows have to be moved out of the default partition."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', choices=['year', 'quarter'], default='quarter')
+        parser.add_argument('--ahead', type=int, default=2, help="Partitions to create beyond the current one.")
+        parser.add_argument('--tablespace', help="Tablespace for newly created partitions.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Partitioning needs PostgreSQL; this database is %s." % connection.vendor)
+
+        months = (12 if options['interval'] == 'year' else 3) * options['ahead']
+        until = timezone.now() + datetime.timedelta(days=31 * months)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                if not is_partitioned(cursor, table):
+                    convert_to_partitioned(cursor, table, options['interval'], until)
+                    self.stdout.write(f"Converted {table} to a partitioned table.")
+                created = ensure_partitions(cursor, table, options['interval'], timezone.now(), until, options['tablespace'])
+                for name in created:
+                    self.stdout.write(f"Created partition {name}.")
+
+        self.stdout.write(self.style.SUCCESS("Partitions are up to date."))
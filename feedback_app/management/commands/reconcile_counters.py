@@ -0,0 +1,25 @@
+# D:\GrowthFlow\feedback_app\management\commands\reconcile_counters.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from feedback_app.counters import drifted_users, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute denormalized counters (Feedback.comment_count and per-user feedback/ack/request counts) from source rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Only report users whose counters have drifted.")
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drifted = drifted_users().count()
+            self.stdout.write(f"{drifted} user(s) with drifted counters.")
+            return
+
+        with transaction.atomic():
+            feedback_rows, user_rows = reconcile_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f"Reconciled counters on {feedback_rows} feedback and {user_rows} user rows."
+        ))
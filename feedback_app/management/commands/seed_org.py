@@ -0,0 +1,184 @@
+# D:\GrowthFlow\feedback_app\management\commands\seed_org.py
+
+import datetime
+import random
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from feedback_app.counters import reconcile_counters
+from feedback_app.models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback
+from feedback_app.rendering import render_comment_html
+
+SENTIMENTS = ['Positive', 'Neutral', 'Needs Improvement']
+PHRASES = [
+    "Consistently delivers well-tested work on schedule.",
+    "Communicates clearly with stakeholders and the wider team.",
+    "Could break large tasks into smaller, reviewable pieces.",
+    "Takes ownership of production issues and follows through.",
+    "Would benefit from sharing context earlier in the sprint.",
+    "Mentors newer teammates generously.",
+    "Estimates are often optimistic; add buffer for unknowns.",
+]
+
+
+@contextmanager
+def _explicit_timestamps(model):
+    """Let bulk_create keep the created_at/updated_at we assign instead of now()."""
+    fields = [model._meta.get_field('created_at'), model._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic organisation (users, manager hierarchy, feedback, comments, requests, peer feedback) for benchmarking."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help="Total number of users to create.")
+        parser.add_argument('--span', type=int, default=8, help="Direct reports per manager.")
+        parser.add_argument('--depth', type=int, default=3, help="Levels of management above individual contributors.")
+        parser.add_argument('--feedback-per-employee', type=int, default=10)
+        parser.add_argument('--comments-per-feedback', type=int, default=3)
+        parser.add_argument('--peer-feedback-per-user', type=int, default=5)
+        parser.add_argument('--requests-per-employee', type=int, default=2)
+        parser.add_argument('--history-days', type=int, default=365, help="Spread created_at over this many days.")
+        parser.add_argument('--password', default='benchpass123', help="Password set on every seeded user.")
+        parser.add_argument('--prefix', default='seed', help="Username prefix, so several orgs can coexist.")
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42, help="Random seed for reproducible datasets.")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.history = datetime.timedelta(days=options['history_days'])
+
+        with transaction.atomic():
+            managers, employees = self._create_users(options)
+            feedback = self._create_feedback(employees, options['feedback_per_employee'])
+            comments = self._create_comments(feedback, options['comments_per_feedback'])
+            requests = self._create_requests(employees, options['requests_per_employee'])
+            peer = self._create_peer_feedback(managers + employees, options['peer_feedback_per_user'])
+            reconcile_counters() # bulk_create skips the signals that maintain counters
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(managers)} managers, {len(employees)} employees, {len(feedback)} feedback, "
+            f"{len(comments)} comments, {len(requests)} feedback requests, {len(peer)} peer feedback."
+        ))
+
+    def _random_past(self, after=None):
+        start = after or (self.now - self.history)
+        return start + (self.now - start) * self.rng.random()
+
+    def _bulk_create(self, model, objs, parent_attr=None):
+        # Spread timestamps over the history window (children after their parent)
+        for obj in objs:
+            parent = getattr(obj, parent_attr) if parent_attr else None
+            obj.created_at = obj.updated_at = self._random_past(after=parent.created_at if parent else None)
+        with _explicit_timestamps(model):
+            model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def _text(self, sentences=2):
+        return ' '.join(self.rng.choice(PHRASES) for _ in range(sentences))
+
+    def _create_users(self, options):
+        prefix, span, depth = options['prefix'], options['span'], options['depth']
+        password = make_password(options['password']) # Hash once; every seeded user shares it
+        total = options['users']
+
+        managers, employees = [], []
+        level = [None] # Managers of the tier being created (None = top of the org)
+        created = 0
+        for tier in range(depth + 1):
+            remaining = total - created
+            if tier < depth:
+                role = 'manager'
+                slots = min(1 if tier == 0 else len(level) * span, remaining - 1) # Leave room for ICs
+            else:
+                role = 'employee'
+                slots = remaining # Everyone left is an individual contributor
+            if slots <= 0:
+                continue
+
+            batch = [
+                CustomUser(
+                    username=f'{prefix}_{role}_{created + i}', email=f'{prefix}_{created + i}@example.com',
+                    password=password, role=role, manager=level[i % len(level)],
+                )
+                for i in range(slots)
+            ]
+            CustomUser.objects.bulk_create(batch, batch_size=self.batch_size)
+            created += len(batch)
+            if role == 'manager':
+                managers.extend(batch)
+                level = batch
+            else:
+                employees.extend(batch)
+        return managers, employees
+
+    def _create_feedback(self, employees, per_employee):
+        objs = [
+            Feedback(
+                manager_id=employee.manager_id, employee=employee,
+                strengths=self._text(3), areas_to_improve=self._text(2),
+                sentiment=self.rng.choice(SENTIMENTS), sentiment_source='manager', is_acknowledged=self.rng.random() < 0.7,
+            )
+            for employee in employees if employee.manager_id
+            for _ in range(per_employee)
+        ]
+        self._bulk_create(Feedback, objs)
+        return objs
+
+    def _create_comments(self, feedback, per_feedback):
+        objs = []
+        for item in feedback:
+            for _ in range(self.rng.randint(0, per_feedback * 2)):
+                is_markdown = self.rng.random() < 0.2
+                if is_markdown:
+                    content = f"**Follow-up:** {self._text(1)}\n\n- {self._text(1)}\n- {self._text(1)}"
+                else:
+                    content = self._text(1)
+                objs.append(Comment(
+                    feedback=item, author_id=self.rng.choice([item.manager_id, item.employee_id]),
+                    content=content, is_markdown=is_markdown,
+                    content_html=render_comment_html(content, is_markdown), # bulk_create skips Comment.save()
+                ))
+        self._bulk_create(Comment, objs, parent_attr='feedback')
+        return objs
+
+    def _create_requests(self, employees, per_employee):
+        objs = [
+            FeedbackRequest(
+                requester=employee, target_manager_id=employee.manager_id,
+                reason=self._text(1), is_fulfilled=self.rng.random() < 0.5,
+            )
+            for employee in employees
+            for _ in range(per_employee)
+        ]
+        self._bulk_create(FeedbackRequest, objs)
+        return objs
+
+    def _create_peer_feedback(self, users, per_user):
+        if len(users) < 2:
+            return []
+        objs = []
+        for giver in users:
+            for _ in range(per_user):
+                receiver = self.rng.choice(users)
+                if receiver.pk == giver.pk:
+                    continue
+                objs.append(PeerFeedback(
+                    giver=giver, receiver=receiver, feedback_text=self._text(2),
+                    is_anonymous=self.rng.random() < 0.4,
+                ))
+        self._bulk_create(PeerFeedback, objs)
+        return objs
@@ -0,0 +1,160 @@
+# D:\GrowthFlow\feedback_app\metrics.py
+
+"""
+Per-worker request metrics, exposed in Prometheus text format at /metrics.
+Filled in by feedback_app.middleware.RequestMetricsMiddleware, with the
+serialization phase (serializer to_representation) booked by
+TimedRepresentationMixin and the render phase (JSON encoding) by
+InstrumentedJSONRenderer.
+"""
+
+import hmac
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestMetrics:
+    """Timings for a single request, attached to the HttpRequest."""
+
+    def __init__(self):
+        self.endpoint = None
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serialize_queries = 0 # Queries issued while serializing, e.g. per-row lookups
+        self.render_time = 0.0
+        self.serializing = False
+
+    def __call__(self, execute, sql, params, many, context):
+        # Installed with connection.execute_wrapper()
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int) # (endpoint, method, status) -> count
+        self._histograms = defaultdict(lambda: [0] * (len(DURATION_BUCKETS) + 1))
+        self._duration_sum = defaultdict(float)
+        self._db_queries = defaultdict(int)
+        self._db_time = defaultdict(float)
+        self._serialize_time = defaultdict(float)
+        self._serialize_queries = defaultdict(int)
+        self._render_time = defaultdict(float)
+        self._over_budget = defaultdict(int)
+
+    def observe(self, method, status, wall, metrics, over_budget=False):
+        endpoint = metrics.endpoint or 'unresolved'
+        with self._lock:
+            self._requests[(endpoint, method, status)] += 1
+            histogram = self._histograms[endpoint]
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if wall <= bound:
+                    histogram[i] += 1
+            histogram[-1] += 1 # +Inf
+            self._duration_sum[endpoint] += wall
+            self._db_queries[endpoint] += metrics.queries
+            self._db_time[endpoint] += metrics.db_time
+            self._serialize_time[endpoint] += metrics.serialize_time
+            self._serialize_queries[endpoint] += metrics.serialize_queries
+            self._render_time[endpoint] += metrics.render_time
+            if over_budget:
+                self._over_budget[endpoint] += 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += ['# HELP growthflow_requests_total Requests handled, by endpoint and status.',
+                      '# TYPE growthflow_requests_total counter']
+            for (endpoint, method, status), count in sorted(self._requests.items()):
+                lines.append(f'growthflow_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            lines += ['# HELP growthflow_request_duration_seconds Wall time per request.',
+                      '# TYPE growthflow_request_duration_seconds histogram']
+            for endpoint, histogram in sorted(self._histograms.items()):
+                for bound, count in zip(DURATION_BUCKETS, histogram):
+                    lines.append(f'growthflow_request_duration_seconds_bucket{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                lines.append(f'growthflow_request_duration_seconds_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram[-1]}')
+                lines.append(f'growthflow_request_duration_seconds_sum{{endpoint="{endpoint}"}} {self._duration_sum[endpoint]:.6f}')
+                lines.append(f'growthflow_request_duration_seconds_count{{endpoint="{endpoint}"}} {histogram[-1]}')
+
+            for name, help_text, values, fmt in (
+                ('growthflow_db_queries_total', 'SQL queries executed.', self._db_queries, '{}'),
+                ('growthflow_db_duration_seconds_total', 'Time spent in the database.', self._db_time, '{:.6f}'),
+                ('growthflow_serialize_duration_seconds_total', 'Time spent in serializer to_representation.',
+                 self._serialize_time, '{:.6f}'),
+                ('growthflow_serialize_queries_total', 'SQL queries issued while serializing.',
+                 self._serialize_queries, '{}'),
+                ('growthflow_render_duration_seconds_total', 'Time spent encoding response bodies.',
+                 self._render_time, '{:.6f}'),
+                ('growthflow_query_budget_exceeded_total', 'Requests over REQUEST_QUERY_BUDGET.',
+                 self._over_budget, '{}'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+                for endpoint, value in sorted(values.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} ' + fmt.format(value))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _request_metrics(request):
+    # DRF wraps the HttpRequest the middleware annotated
+    return getattr(getattr(request, '_request', request), 'request_metrics', None)
+
+
+class TimedRepresentationMixin:
+    """
+    Serializer mixin that books to_representation() time, and the queries it
+    triggers, as serialization on the request's metrics. Nested and per-row
+    child serializers are counted once, inside their outermost parent.
+    """
+
+    def to_representation(self, instance):
+        metrics = _request_metrics(self.context.get('request'))
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        queries, start = metrics.queries, time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializing = False
+            metrics.serialize_time += time.perf_counter() - start
+            metrics.serialize_queries += metrics.queries - queries
+
+
+class InstrumentedJSONRenderer(JSONRenderer):
+    """JSONRenderer that books its time as rendering on the request's metrics."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics = _request_metrics((renderer_context or {}).get('request'))
+            if metrics is not None:
+                metrics.render_time += time.perf_counter() - start
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        return HttpResponse(status=403) # Closed unless a scrape token is configured
+    supplied = request.META.get('HTTP_AUTHORIZATION', '').removeprefix('Bearer ')
+    if not hmac.compare_digest(supplied, token):
+        return HttpResponse(status=401)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4')
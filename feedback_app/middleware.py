@@ -0,0 +1,145 @@
+# D:\GrowthFlow\feedback_app\middleware.py
+
+import logging
+import re
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .metrics import RequestMetrics, registry
+from .routers import is_pinned, pin_to_primary, replica_reads_allowed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None # Falls back to gzip only
+
+re_accepts_br = re.compile(r'\bbr\b')
+
+logger = logging.getLogger(__name__)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Negotiated response compression: brotli when the client accepts it and the
+    library is installed, gzip otherwise. Event streams are left untouched so
+    notifications aren't held back in a compressor's buffer. HTML (the browsable
+    API, which embeds a CSRF token) always takes the gzip path, whose random
+    filename padding is Django's BREACH mitigation; brotli has no equivalent.
+    """
+    min_length = 200
+    brotli_quality = 5 # Good ratio for JSON without the CPU cost of quality 11
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith('text/event-stream'):
+            return response
+
+        if (brotli is not None and not response.streaming
+                and not content_type.startswith('text/html')
+                and not response.has_header('Content-Encoding')
+                and len(response.content) >= self.min_length
+                and re_accepts_br.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))):
+            patch_vary_headers(response, ('Accept-Encoding',))
+            compressed_content = brotli.compress(response.content, quality=self.brotli_quality)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers['Content-Length'] = str(len(compressed_content))
+            etag = response.get('ETag')
+            if etag and etag.startswith('"'):
+                response.headers['ETag'] = 'W/' + etag
+            response.headers['Content-Encoding'] = 'br'
+            return response
+
+        return super().process_response(request, response)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records SQL count, DB time, serialization and render time and wall time per request,
+    labelled by viewset action (e.g. `FeedbackViewSet.manager_summary`).
+    Adds a `Server-Timing` header, feeds /metrics and warns when a request
+    runs more queries than REQUEST_QUERY_BUDGET.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        request.request_metrics = metrics
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(metrics))
+            response = self.get_response(request)
+        wall = time.perf_counter() - start
+
+        budget = getattr(settings, 'REQUEST_QUERY_BUDGET', None)
+        over_budget = budget is not None and metrics.queries > budget
+        if over_budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d) in %.1fms",
+                request.method, metrics.endpoint or request.path, metrics.queries, budget, wall * 1000,
+            )
+
+        if metrics.endpoint != 'metrics':
+            registry.observe(request.method, response.status_code, wall, metrics, over_budget)
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"',
+            f'serialize;dur={metrics.serialize_time * 1000:.1f};desc="{metrics.serialize_queries} queries"',
+            f'render;dur={metrics.render_time * 1000:.1f}',
+            f'total;dur={wall * 1000:.1f}',
+        ])
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None:
+            request.request_metrics.endpoint = view_func.__name__.removesuffix('_view')
+            return None
+        action = (getattr(view_func, 'actions', None) or {}).get(request.method.lower())
+        request.request_metrics.endpoint = f'{view_class.__name__}.{action}' if action else view_class.__name__
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets safe-method requests read from replicas (see routers.py), except for
+    users who wrote recently. Unsafe requests pin their user to the primary
+    for REPLICA_STICKINESS_SECONDS.
+    """
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _user_id(self, request):
+        # Decided before DRF authenticates, so read the claim from the JWT without a DB lookup
+        header = request.META.get('HTTP_AUTHORIZATION', '').split()
+        if len(header) == 2 and header[0] in jwt_settings.AUTH_HEADER_TYPES:
+            try:
+                return AccessToken(header[1]).get(jwt_settings.USER_ID_CLAIM)
+            except TokenError:
+                return None
+        return request.session.get('_auth_user_id') if hasattr(request, 'session') else None
+
+    def __call__(self, request):
+        user_id = self._user_id(request)
+        safe = request.method in self.SAFE_METHODS
+        token = replica_reads_allowed.set(safe and not is_pinned(user_id))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads_allowed.reset(token)
+        if not safe:
+            pin_to_primary(user_id)
+        return response
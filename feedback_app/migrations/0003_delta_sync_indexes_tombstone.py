@@ -0,0 +1,45 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0002_alter_feedback_options_alter_customuser_groups_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['updated_at'], name='feedback_ap_updated_321180_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['updated_at'], name='feedback_ap_updated_c4a286_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedbackrequest',
+            index=models.Index(fields=['updated_at'], name='feedback_ap_updated_d6895e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peerfeedback',
+            index=models.Index(fields=['updated_at'], name='feedback_ap_updated_b777c0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['resource', 'deleted_at'], name='feedback_ap_resourc_4f0074_idx'),
+        ),
+    ]
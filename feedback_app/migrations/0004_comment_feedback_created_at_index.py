@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0003_delta_sync_indexes_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['feedback', 'created_at'], name='feedback_ap_feedbac_ad0fd3_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:37
+
+from django.db import migrations, models
+
+from feedback_app.rendering import render_comment_html
+
+
+def render_existing_comments(apps, schema_editor):
+    Comment = apps.get_model('feedback_app', 'Comment')
+    batch = []
+    for comment in Comment.objects.only('id', 'content', 'is_markdown').iterator(chunk_size=2000):
+        comment.content_html = render_comment_html(comment.content, comment.is_markdown)
+        batch.append(comment)
+        if len(batch) == 2000:
+            Comment.objects.bulk_update(batch, ['content_html'])
+            batch = []
+    Comment.objects.bulk_update(batch, ['content_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0004_comment_feedback_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='content_html',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(render_existing_comments, migrations.RunPython.noop),
+    ]
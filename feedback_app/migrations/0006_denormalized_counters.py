@@ -0,0 +1,40 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:38
+
+from django.db import migrations, models
+
+from feedback_app.counters import reconcile_counters
+
+
+def backfill_counters(apps, schema_editor):
+    reconcile_counters(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0005_comment_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='feedback_received_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='open_request_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='pending_ack_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='feedback',
+            name='comment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
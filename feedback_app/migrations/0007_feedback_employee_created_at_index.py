@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0006_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['employee', 'created_at'], name='feedback_ap_employe_10674f_idx'),
+        ),
+    ]
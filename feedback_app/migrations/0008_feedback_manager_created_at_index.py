@@ -0,0 +1,17 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0007_feedback_employee_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['manager', 'created_at'], name='feedback_ap_manager_9821b9_idx'),
+        ),
+    ]
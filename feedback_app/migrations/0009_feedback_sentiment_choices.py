@@ -0,0 +1,37 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:46
+
+from django.db import migrations, models
+from django.db.models.functions import Trim
+
+SENTIMENTS = ['Positive', 'Neutral', 'Needs Improvement']
+
+
+def normalize_sentiments(apps, schema_editor):
+    """Map hand-entered values onto the choices; anything else is cleared for the classifier."""
+    Feedback = apps.get_model('feedback_app', 'Feedback')
+    for sentiment in SENTIMENTS:
+        Feedback.objects.annotate(stored=Trim('sentiment')).filter(stored__iexact=sentiment).update(
+            sentiment=sentiment, sentiment_source='manager',
+        )
+    Feedback.objects.exclude(sentiment__in=SENTIMENTS).update(sentiment=None, sentiment_source=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0008_feedback_manager_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedback',
+            name='sentiment_source',
+            field=models.CharField(blank=True, choices=[('manager', 'Manager'), ('classifier', 'Classifier')], editable=False, max_length=10, null=True),
+        ),
+        migrations.RunPython(normalize_sentiments, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='feedback',
+            name='sentiment',
+            field=models.CharField(blank=True, choices=[('Positive', 'Positive'), ('Neutral', 'Neutral'), ('Needs Improvement', 'Needs Improvement')], db_index=True, max_length=50, null=True),
+        ),
+    ]
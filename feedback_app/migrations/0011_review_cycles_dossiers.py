@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0010_outboxevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('starts_at', models.DateTimeField()),
+                ('ends_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('building', 'Building'), ('ready', 'Ready')], default='building', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_cycles_created', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-starts_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Dossier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.JSONField(default=dict)),
+                ('pdf', models.BinaryField(blank=True, null=True)),
+                ('built_at', models.DateTimeField()),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dossiers', to='feedback_app.reviewcycle')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dossiers', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['cycle', 'employee'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dossier',
+            constraint=models.UniqueConstraint(fields=('cycle', 'employee'), name='unique_dossier_per_cycle'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.23 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0011_review_cycles_dossiers'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created_at', 'id'], name='feedback_ap_created_a54dd0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['created_at', 'id'], name='feedback_ap_created_df89ed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedbackrequest',
+            index=models.Index(fields=['created_at', 'id'], name='feedback_ap_created_ea9599_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='peerfeedback',
+            index=models.Index(fields=['created_at', 'id'], name='feedback_ap_created_6581ec_idx'),
+        ),
+    ]
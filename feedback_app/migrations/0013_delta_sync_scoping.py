@@ -0,0 +1,39 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:16
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def reset_sync_tokens(apps, schema_editor):
+    """Earlier tombstones carry no audience, so every client resyncs in full once."""
+    CustomUser = apps.get_model('feedback_app', 'CustomUser')
+    CustomUser.objects.update(sync_reset_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0012_created_at_id_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tombstone',
+            name='feedback_ap_resourc_4f0074_idx',
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='sync_reset_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='visible_to',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['visible_to', 'resource', 'deleted_at'], name='feedback_ap_visible_3b5ce9_idx'),
+        ),
+        migrations.RunPython(reset_sync_tokens, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.23 on 2026-10-18 23:32
+
+from django.db import migrations, models
+
+SENTIMENTS = ['Positive', 'Neutral', 'Needs Improvement']
+
+
+def clear_invalid_sentiments(apps, schema_editor):
+    """Rows written past the choices since 0009 (e.g. '' from bulk writes) would fail the constraint."""
+    Feedback = apps.get_model('feedback_app', 'Feedback')
+    Feedback.objects.exclude(sentiment__in=SENTIMENTS).exclude(sentiment=None).update(sentiment=None, sentiment_source=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback_app', '0013_delta_sync_scoping'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_invalid_sentiments, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='feedback',
+            constraint=models.CheckConstraint(check=models.Q(('sentiment__in', ['Positive', 'Neutral', 'Needs Improvement']), ('sentiment__isnull', True), _connector='OR'), name='feedback_sentiment_in_choices'),
+        ),
+    ]
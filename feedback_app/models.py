@@ -1,8 +1,11 @@
 # D:\GrowthFlow\feedback_app\models.py
 
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
+from .rendering import render_comment_html
+
 class CustomUser(AbstractUser):
     ROLE_CHOICES = [
         ('manager', 'Manager'),
@@ -17,6 +20,12 @@ class CustomUser(AbstractUser):
         related_name='employees', # A manager can access their 'employees'
         limit_choices_to={'role': 'manager'} # Only managers can be selected as managers
     )
+    # Denormalized counters, maintained in counters.py (reconcile with `manage.py reconcile_counters`)
+    feedback_received_count = models.IntegerField(default=0, editable=False)
+    pending_ack_count = models.IntegerField(default=0, editable=False) # Unacknowledged feedback received
+    open_request_count = models.IntegerField(default=0, editable=False) # Unfulfilled feedback requests made
+    # Set when what this user can list changes (manager, role); older delta-sync tokens get a full resync
+    sync_reset_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -39,13 +48,37 @@ class Feedback(models.Model):
     )
     strengths = models.TextField()
     areas_to_improve = models.TextField()
-    sentiment = models.CharField(max_length=50, blank=True, null=True) # Optional field
+    SENTIMENT_CHOICES = [
+        ('Positive', 'Positive'),
+        ('Neutral', 'Neutral'),
+        ('Needs Improvement', 'Needs Improvement'),
+    ]
+    SENTIMENT_SOURCE_CHOICES = [
+        ('manager', 'Manager'),
+        ('classifier', 'Classifier'), # manage.py classify_sentiment
+    ]
+    sentiment = models.CharField(max_length=50, choices=SENTIMENT_CHOICES, blank=True, null=True, db_index=True)
+    sentiment_source = models.CharField(max_length=10, choices=SENTIMENT_SOURCE_CHOICES, blank=True, null=True, editable=False)
     is_acknowledged = models.BooleanField(default=False) # Employee acknowledges feedback
+    comment_count = models.IntegerField(default=0, editable=False) # Maintained in counters.py
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at'] # Order by most recent feedback first
+        indexes = [
+            models.Index(fields=['updated_at']), # Delta sync (?updated_since=)
+            models.Index(fields=['employee', 'created_at']), # Latest feedback per report
+            models.Index(fields=['manager', 'created_at']), # Manager summary's 180-day window
+            models.Index(fields=['created_at', 'id']), # Admin changelist order and date hierarchy
+        ]
+        constraints = [
+            # Choices are only validated by forms and serializers; keep raw SQL and bulk writes honest too
+            models.CheckConstraint(
+                check=models.Q(sentiment__in=['Positive', 'Neutral', 'Needs Improvement']) | models.Q(sentiment__isnull=True),
+                name='feedback_sentiment_in_choices',
+            ),
+        ]
 
     def __str__(self):
         return f"Feedback from {self.manager.username} to {self.employee.username} on {self.created_at.strftime('%Y-%m-%d')}"
@@ -65,14 +98,29 @@ class Comment(models.Model):
     content = models.TextField()
     # Flag for Markdown support (will be true if content is markdown)
     is_markdown = models.BooleanField(default=False)
+    # Sanitized HTML of `content`, rendered once per edit in save()
+    content_html = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['created_at'] # Order comments chronologically
+        indexes = [
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['feedback', 'created_at']), # Per-thread pages and latest-N previews
+            models.Index(fields=['created_at', 'id']),
+        ]
 
     def __str__(self):
-        return f"Comment by {self.author.username} on Feedback ID {self.feedback.id}"
+        return f"Comment by {self.author.username} on Feedback ID {self.feedback_id}"
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'content', 'is_markdown'} & set(update_fields):
+            self.content_html = render_comment_html(self.content, self.is_markdown)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'content_html'}
+        super().save(*args, **kwargs)
 
 # --- NEW MODEL: Feedback Request ---
 class FeedbackRequest(models.Model):
@@ -99,6 +147,7 @@ class FeedbackRequest(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['updated_at']), models.Index(fields=['created_at', 'id'])]
 
     def __str__(self):
         return f"Feedback Request from {self.requester.username} to {self.target_manager.username if self.target_manager else 'Unassigned'}"
@@ -127,7 +176,89 @@ class PeerFeedback(models.Model):
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = "Peer Feedback"
+        indexes = [models.Index(fields=['updated_at']), models.Index(fields=['created_at', 'id'])]
 
     def __str__(self):
         giver_display = "Anonymous" if self.is_anonymous else self.giver.username
-        return f"Peer Feedback from {giver_display} to {self.receiver.username}"
\ No newline at end of file
+        return f"Peer Feedback from {giver_display} to {self.receiver.username}"
+
+
+# --- NEW MODEL: Tombstone for deleted rows ---
+class Tombstone(models.Model):
+    # Records deletions so delta-sync clients can drop rows they cached
+    # One row per user who could list the row, plus one with visible_to NULL (what superusers sync).
+    # Rows that merely left a user's scope get a tombstone for that user only.
+    resource = models.CharField(max_length=30) # e.g. 'feedback', 'comment'
+    object_id = models.BigIntegerField()
+    visible_to = models.BigIntegerField(null=True, blank=True) # CustomUser id; not a FK so user deletes never block
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [models.Index(fields=['visible_to', 'resource', 'deleted_at'])]
+
+    def __str__(self):
+        return f"Deleted {self.resource} ID {self.object_id}"
+
+
+# --- NEW MODEL: Transactional outbox ---
+class OutboxEvent(models.Model):
+    # Written in the same transaction as the change it describes; drained by `manage.py drain_outbox`
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'), # Gave up after OUTBOX_MAX_ATTEMPTS
+    ]
+    topic = models.CharField(max_length=50) # e.g. 'feedback.created'
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    available_at = models.DateTimeField(default=timezone.now) # Not claimable before this (leases, retry backoff)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [models.Index(fields=['status', 'available_at'])]
+
+    def __str__(self):
+        return f"{self.topic} ({self.status})"
+
+
+# --- NEW MODEL: Review cycles with precomputed dossiers ---
+class ReviewCycle(models.Model):
+    # Freezes a date range; dossiers are built once (see dossiers.py) and served for the whole cycle
+    STATUS_CHOICES = [
+        ('building', 'Building'),
+        ('ready', 'Ready'),
+    ]
+    name = models.CharField(max_length=100)
+    starts_at = models.DateTimeField()
+    ends_at = models.DateTimeField() # Exclusive
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='building')
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='review_cycles_created')
+    created_at = models.DateTimeField(auto_now_add=True)
+    built_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-starts_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.starts_at:%Y-%m-%d} to {self.ends_at:%Y-%m-%d})"
+
+
+class Dossier(models.Model):
+    # One employee's frozen review material for a cycle; `data` is served as-is
+    cycle = models.ForeignKey(ReviewCycle, on_delete=models.CASCADE, related_name='dossiers')
+    employee = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='dossiers')
+    data = models.JSONField(default=dict)
+    pdf = models.BinaryField(null=True, blank=True) # Rendered at build time when ReportLab is installed
+    built_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['cycle', 'employee']
+        constraints = [models.UniqueConstraint(fields=['cycle', 'employee'], name='unique_dossier_per_cycle')]
+
+    def __str__(self):
+        return f"Dossier for {self.employee.username} in {self.cycle.name}"
@@ -0,0 +1,167 @@
+# D:\GrowthFlow\feedback_app\notifications.py
+
+"""
+Server-Sent Events push channel for feedback activity.
+
+Clients open `GET /api/notifications/stream/` once (served through asgi.py)
+instead of polling `/api/feedback/`. Model signals publish small events to the
+users involved; each ASGI worker keeps an in-process fan-out of open streams.
+
+With NOTIFICATIONS_BACKEND = 'postgres' events are relayed through Postgres
+LISTEN/NOTIFY so a write handled by one worker reaches streams held by another.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connection, transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15
+
+
+class LocalBroker:
+    """In-process fan-out from user id to every open stream for that user."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {} # user_id -> set of (loop, queue)
+
+    def subscribe(self, user_id, loop=None):
+        loop = loop or asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add((loop, queue))
+        return loop, queue
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subs = self._subscribers.get(user_id)
+            if subs:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[user_id]
+
+    def deliver(self, user_ids, event):
+        # Called from request threads or the LISTEN thread; queues belong to the event loop
+        with self._lock:
+            targets = [sub for uid in user_ids for sub in self._subscribers.get(uid, ())]
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+
+broker = LocalBroker()
+_listener_started = False
+_listener_lock = threading.Lock()
+
+
+def _use_postgres():
+    return getattr(settings, 'NOTIFICATIONS_BACKEND', 'local') == 'postgres'
+
+
+def _channel():
+    return getattr(settings, 'NOTIFICATIONS_CHANNEL', 'growthflow_events')
+
+
+def _listen_forever():
+    import psycopg # Only needed for the postgres backend
+
+    db = settings.DATABASES['default']
+    while True:
+        try:
+            with psycopg.connect(
+                dbname=db['NAME'], user=db['USER'], password=db['PASSWORD'],
+                host=db['HOST'], port=db['PORT'], autocommit=True,
+            ) as conn:
+                conn.execute(f'LISTEN "{_channel()}"')
+                for notify in conn.notifies():
+                    message = json.loads(notify.payload)
+                    broker.deliver(message['users'], message['event'])
+        except Exception:
+            logger.exception("Notification listener lost its connection, reconnecting.")
+            threading.Event().wait(1)
+
+
+def ensure_listener():
+    """Start the LISTEN thread for this worker the first time a stream opens."""
+    global _listener_started
+    if not _use_postgres() or _listener_started:
+        return
+    with _listener_lock:
+        if not _listener_started:
+            threading.Thread(target=_listen_forever, name='notification-listener', daemon=True).start()
+            _listener_started = True
+
+
+def _send(user_ids, event):
+    if _use_postgres():
+        payload = json.dumps({'users': user_ids, 'event': event})
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [_channel(), payload])
+    else:
+        broker.deliver(user_ids, event)
+
+
+def publish(user_ids, event_type, **data):
+    """Notify the given users once the current transaction commits."""
+    user_ids = sorted({uid for uid in user_ids if uid is not None})
+    if not user_ids:
+        return
+    event = {'type': event_type, **data}
+    transaction.on_commit(lambda: _send(user_ids, event))
+
+
+def _authenticate_stream(request):
+    # EventSource can't send headers, so accept the access token as ?token= too
+    auth = JWTAuthentication()
+    try:
+        raw_token = request.GET.get('token')
+        if raw_token:
+            return auth.get_user(auth.get_validated_token(raw_token))
+        result = auth.authenticate(request)
+        if result is not None:
+            return result[0]
+    except (AuthenticationFailed, TokenError): # Bad token (InvalidToken), or an inactive or deleted user
+        return None
+    return request.user if request.user.is_authenticated else None
+
+
+async def _event_stream(user):
+    subscription = broker.subscribe(user.id)
+    try:
+        yield 'retry: 5000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription[1].get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(user.id, subscription)
+
+
+async def notification_stream(request):
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI Django buffers the whole async iterator, which never ends: the client would get
+        # nothing and the worker would be held forever
+        return JsonResponse({"detail": "The notification stream requires an ASGI server."}, status=501)
+    user = await sync_to_async(_authenticate_stream)(request)
+    if user is None:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    ensure_listener()
+    response = StreamingHttpResponse(_event_stream(user), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no' # Stop nginx from buffering the stream
+    return response
@@ -0,0 +1,230 @@
+# D:\GrowthFlow\feedback_app\org_import.py
+
+"""
+Bulk import of users and their manager links from CSV.
+
+Columns: username (required), email, first_name, last_name, role
+('manager'/'employee', default 'employee'), manager (a username, either in
+the same file or already in the database), password (blank gives an unusable
+password, e.g. for invite/SSO flows).
+
+The whole file is validated before anything is written: the CustomUser field
+validators (username characters and length, email format, name lengths),
+duplicate or existing usernames, unknown roles, managers that don't exist or aren't managers, and
+cycles in the reporting hierarchy. Rows are then inserted level by level down
+the hierarchy with bulk_create, so every manager_id is known from the previous
+level's primary keys without a second UPDATE pass. Password hashing, the
+dominant cost, runs in a process pool from `manage.py import_org`; on the web
+endpoint it uses threads instead, since forking a request worker would copy its
+database connections and the notification listener thread. The hashlib and
+argon2 backends release the GIL, so threads still hash in parallel.
+"""
+
+import csv
+import itertools
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .models import CustomUser
+
+ROLES = {role for role, _ in CustomUser.ROLE_CHOICES}
+LOOKUP_CHUNK = 5000 # Usernames per IN (...) query
+NOT_UTF8 = "the file isn't UTF-8 encoded; export it as 'CSV UTF-8' and retry"
+CHECKED_FIELDS = ['username', 'email', 'first_name', 'last_name'] # Run through the model field's clean()
+
+
+class ImportFileError(ValueError):
+    """The file itself can't be read as CSV text (e.g. it isn't UTF-8)."""
+
+
+class ImportResult:
+    def __init__(self, created=0, errors=None):
+        self.created = created
+        self.errors = errors or [] # ["line 12: ...", ...]
+
+
+def read_rows(stream, limit=None):
+    """
+    Rows from a CSV text or binary stream, as dicts with stripped values and their line numbers.
+    With `limit`, stops after limit + 1 rows, so callers can reject oversized files without parsing them.
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = _decoded_lines(stream)
+    reader = csv.DictReader(stream)
+    rows = reader if limit is None else itertools.islice(reader, limit + 1)
+    try:
+        return [
+            ({(key or '').strip(): (value or '').strip() for key, value in row.items()}, reader.line_num)
+            for row in rows
+        ]
+    except UnicodeDecodeError: # Text streams decode in chunks, so the line isn't known
+        raise ImportFileError(NOT_UTF8) from None
+
+
+def _decoded_lines(stream):
+    # Decoding line by line (rather than io.TextIOWrapper) lets an encoding error name its line
+    for number, line in enumerate(stream, 1):
+        try:
+            yield line.decode('utf-8-sig' if number == 1 else 'utf-8')
+        except UnicodeDecodeError:
+            raise ImportFileError(f"line {number}: {NOT_UTF8}") from None
+
+
+def _field_errors(row):
+    """Messages from CustomUser's own field validation (username_validator, max_length, EmailValidator)."""
+    errors = []
+    for name in CHECKED_FIELDS:
+        try:
+            CustomUser._meta.get_field(name).clean(row.get(name, ''), None)
+        except ValidationError as e:
+            errors.extend(f"{name}: {message}" for message in e.messages)
+    return errors
+
+
+def _existing(usernames, fields):
+    """{username: (values...)} for the given usernames that already exist, looked up in chunks."""
+    usernames = list(usernames)
+    found = {}
+    for start in range(0, len(usernames), LOOKUP_CHUNK):
+        chunk = usernames[start:start + LOOKUP_CHUNK]
+        for row in CustomUser.objects.filter(username__in=chunk).values_list('username', *fields):
+            found[row[0]] = row[1:]
+    return found
+
+
+def validate(rows):
+    """Errors for the parsed rows, plus {username: row} for the valid file."""
+    errors = []
+    by_username = {}
+    for row, line in rows:
+        username = row.get('username', '')
+        role = row.get('role') or 'employee'
+        if not username:
+            errors.append(f"line {line}: username is required")
+        elif username in by_username:
+            errors.append(f"line {line}: duplicate username '{username}'")
+        elif role not in ROLES:
+            errors.append(f"line {line}: unknown role '{role}'")
+        elif field_errors := _field_errors(row):
+            errors.extend(f"line {line}: {message}" for message in field_errors)
+        else:
+            row.update(role=role, line=line)
+            by_username[username] = row
+
+    for username in _existing(by_username, []):
+        errors.append(f"line {by_username[username]['line']}: user '{username}' already exists")
+
+    referenced = {row['manager'] for row in by_username.values() if row.get('manager')}
+    existing_managers = _existing(referenced - by_username.keys(), ['role'])
+    for username, row in by_username.items():
+        manager = row.get('manager')
+        if not manager:
+            continue
+        role = by_username[manager]['role'] if manager in by_username else (existing_managers.get(manager) or [None])[0]
+        if role is None:
+            errors.append(f"line {row['line']}: manager '{manager}' not found")
+        elif role != 'manager':
+            errors.append(f"line {row['line']}: manager '{manager}' is not a manager")
+
+    errors.extend(_cycles(by_username))
+    return errors, by_username
+
+
+def _cycles(by_username):
+    """One error per reporting cycle among the file's rows (A -> B -> ... -> A)."""
+    errors = []
+    state = {} # username -> 'visiting' | 'done'
+    for start in by_username:
+        path = []
+        node = start
+        while node in by_username and node not in state:
+            state[node] = 'visiting'
+            path.append(node)
+            node = by_username[node].get('manager') or None
+        if node in state and state[node] == 'visiting':
+            loop = path[path.index(node):]
+            errors.append(
+                f"line {by_username[node]['line']}: reporting cycle " + ' -> '.join(loop + [node])
+            )
+        for visited in path:
+            state[visited] = 'done'
+    return errors
+
+
+def _init_hasher(settings_module):
+    # Spawned (non-forked) workers start without Django configured
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords, workers=None, processes=True):
+    """
+    make_password() for each entry (None gives an unusable password), spread over a
+    process pool, or a thread pool with processes=False (inside a serving process).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < 2:
+        return [make_password(password) for password in passwords]
+    if not processes:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(make_password, passwords))
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_hasher, initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'settings'),)
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def import_users(rows, batch_size=2000, workers=None, dry_run=False, processes=False):
+    """
+    Validate and insert users from read_rows() output. All-or-nothing; returns an ImportResult.
+    Only pass processes=True outside a web worker (see hash_passwords).
+    """
+    errors, by_username = validate(rows)
+    if errors or dry_run:
+        return ImportResult(0, errors)
+
+    hashes = hash_passwords([row.get('password') or None for row in by_username.values()], workers, processes)
+    for row, password in zip(by_username.values(), hashes):
+        row['password'] = password
+
+    existing_ids = {
+        username: values[0]
+        for username, values in _existing(
+            {row['manager'] for row in by_username.values() if row.get('manager')} - by_username.keys(), ['id']
+        ).items()
+    }
+    reports = defaultdict(list) # In-file manager username -> their rows
+    level = [] # Top of the imported hierarchy: no manager, or one already in the database
+    for row in by_username.values():
+        if row.get('manager') in by_username:
+            reports[row['manager']].append(row)
+        else:
+            level.append(row)
+
+    created = 0
+    with transaction.atomic():
+        while level:
+            users = [
+                CustomUser(
+                    username=row['username'], email=row.get('email', ''), first_name=row.get('first_name', ''),
+                    last_name=row.get('last_name', ''), role=row['role'], password=row['password'],
+                    manager_id=existing_ids.get(row.get('manager')),
+                )
+                for row in level
+            ]
+            CustomUser.objects.bulk_create(users, batch_size=batch_size)
+            if any(user.pk is None for user in users): # Backends that can't return ids from bulk inserts
+                ids = _existing([user.username for user in users], ['id'])
+                for user in users:
+                    user.pk = ids[user.username][0]
+            created += len(users)
+            existing_ids.update({user.username: user.pk for user in users})
+            level = [report for user in users for report in reports[user.username]]
+    return ImportResult(created, [])
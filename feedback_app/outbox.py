@@ -0,0 +1,130 @@
+# D:\GrowthFlow\feedback_app\outbox.py
+
+"""
+Transactional outbox for side effects.
+
+Signal handlers call `enqueue()` while the write is still in its transaction
+(write API requests run inside `transaction.atomic`, see AtomicWritesMixin), so
+an event exists if and only if its change committed. `manage.py drain_outbox`
+claims pending events in batches, runs the handlers registered for each topic
+with `@handles(...)`, and retries failures with exponential backoff.
+
+Handlers run at least once and possibly concurrently or out of order, so they
+must be idempotent and re-read current state rather than trust the payload.
+"""
+
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .dossiers import build_cycle
+from .models import Feedback, OutboxEvent, ReviewCycle
+from .sentiment import classify
+
+logger = logging.getLogger(__name__)
+
+_handlers = {} # topic -> [callable(payload)]
+
+
+def handles(*topics):
+    def register(func):
+        for topic in topics:
+            _handlers.setdefault(topic, []).append(func)
+        return func
+    return register
+
+
+def enqueue(topic, **payload):
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def claim(batch_size):
+    """Lease up to batch_size due events to this worker; concurrent workers skip rows already locked."""
+    now = timezone.now()
+    lease = datetime.timedelta(seconds=_setting('OUTBOX_LEASE_SECONDS', 60))
+    with transaction.atomic():
+        ids = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+                       .filter(status='pending', available_at__lte=now)
+                       .order_by('available_at', 'id').values_list('id', flat=True)[:batch_size]
+        )
+        # Until the lease runs out nobody else claims them; a crashed worker's events come back after it
+        OutboxEvent.objects.filter(id__in=ids).update(available_at=now + lease, attempts=F('attempts') + 1)
+    return list(OutboxEvent.objects.filter(id__in=ids).order_by('id'))
+
+
+def process(event):
+    """Run every handler for the event and record the outcome. Returns True on success."""
+    try:
+        for handler in _handlers.get(event.topic, ()):
+            handler(event.payload)
+    except Exception as exc:
+        logger.exception("Outbox event %s (%s) failed on attempt %s.", event.id, event.topic, event.attempts)
+        if event.attempts >= _setting('OUTBOX_MAX_ATTEMPTS', 5):
+            changes = {'status': 'failed'}
+        else:
+            backoff = _setting('OUTBOX_RETRY_BACKOFF_SECONDS', 5) * 2 ** (event.attempts - 1)
+            changes = {'available_at': timezone.now() + datetime.timedelta(seconds=backoff)}
+        OutboxEvent.objects.filter(id=event.id).update(last_error=repr(exc), **changes)
+        return False
+    OutboxEvent.objects.filter(id=event.id).update(status='done', processed_at=timezone.now())
+    return True
+
+
+def _process_in_thread(event):
+    try:
+        return process(event)
+    finally:
+        close_old_connections() # Each pool thread holds its own connection
+
+
+def drain(batch_size=100, concurrency=1):
+    """Process due events until none are left. Returns (succeeded, failed)."""
+    succeeded = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while True:
+            events = claim(batch_size)
+            if not events:
+                return succeeded, failed
+            if concurrency == 1:
+                results = [process(event) for event in events]
+            else:
+                results = list(pool.map(_process_in_thread, events))
+            succeeded += results.count(True)
+            failed += results.count(False)
+
+
+def purge(older_than):
+    """Delete processed events older than the given timedelta."""
+    cutoff = timezone.now() - older_than
+    return OutboxEvent.objects.filter(status='done', processed_at__lt=cutoff).delete()[0]
+
+
+# --- Handlers ---
+@handles('feedback.created', 'feedback.updated')
+def label_sentiment(payload):
+    # Same labelling as `classify_sentiment`, without waiting for the next backfill
+    feedback = Feedback.objects.filter(pk=payload['id'], sentiment__isnull=True) \
+                               .values_list('strengths', 'areas_to_improve').first()
+    if feedback is None:
+        return # Deleted, or labelled in the meantime
+    Feedback.objects.filter(pk=payload['id'], sentiment__isnull=True).update(
+        sentiment=classify(*feedback), sentiment_source='classifier', updated_at=timezone.now(),
+    )
+
+
+@handles('review_cycle.build')
+def build_review_cycle(payload):
+    # A full build should fit in OUTBOX_LEASE_SECONDS; for very large orgs use `manage.py build_review_cycle`
+    cycle = ReviewCycle.objects.filter(pk=payload['id']).first()
+    if cycle is not None:
+        build_cycle(cycle)
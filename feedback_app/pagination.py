@@ -0,0 +1,11 @@
+# D:\GrowthFlow\feedback_app\pagination.py
+
+from rest_framework.pagination import CursorPagination
+
+
+class CommentThreadPagination(CursorPagination):
+    """Newest-first pages of a feedback thread; `?cursor=` walks back in time."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id') # Backed by the (feedback, created_at) index
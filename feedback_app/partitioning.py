@@ -0,0 +1,176 @@
+# D:\GrowthFlow\feedback_app\partitioning.py
+
+"""
+Optional Postgres range partitioning by `created_at` for the history tables.
+
+`manage.py partition_history` converts Feedback, Comment and PeerFeedback to
+declaratively partitioned tables (yearly or quarterly) and keeps partitions
+created ahead of time. `manage.py archive_history` folds partitions older than
+a cutoff into one `<table>_archive` partition, optionally on a cold tablespace,
+so the partitions (and their local indexes) that daily queries touch stay small.
+
+Postgres requires the partition key in every unique constraint, so the primary
+key becomes (id, created_at). Foreign keys *into* a converted table (today only
+comment.feedback_id) go with the `DROP TABLE ... CASCADE` of the legacy copy and
+can't be recreated: from then on only Django's on_delete keeps comments from
+pointing at deleted feedback, so raw SQL deletes can leave orphans.
+Identity columns aren't allowed on partitioned tables before Postgres 17, so
+ids come from a plain sequence default instead.
+
+Locking: the conversion renames the table, so it holds an ACCESS EXCLUSIVE lock
+on each table from the rename until the transaction commits, through the full
+row copy and index rebuild. Reads and writes of the three tables wait for all
+of it, so convert in a maintenance window. Creating, attaching and detaching
+partitions also lock the parent exclusively: cheap when the default partition
+is empty, but moving rows out of it, and the row copy of an archive run, hold
+that lock for as long as the copy takes.
+"""
+
+import datetime
+import re
+
+PARTITIONED_TABLES = ['feedback_app_feedback', 'feedback_app_comment', 'feedback_app_peerfeedback']
+
+re_bound = re.compile(r"FROM \((?:'([^']+)'|MINVALUE)\) TO \('([^']+)'\)")
+
+
+def _floor(moment, interval):
+    month = 1 if interval == 'year' else (moment.month - 1) // 3 * 3 + 1
+    return datetime.datetime(moment.year, month, 1, tzinfo=datetime.timezone.utc)
+
+
+def _next(start, interval):
+    if interval == 'year':
+        return start.replace(year=start.year + 1)
+    month = start.month + 3
+    return start.replace(year=start.year + (month - 1) // 12, month=(month - 1) % 12 + 1)
+
+
+def partition_bounds(interval, start, end):
+    """[(suffix, lower, upper), ...] covering start..end in whole years or quarters."""
+    if interval not in ('year', 'quarter'):
+        raise ValueError("interval must be 'year' or 'quarter'")
+    bounds = []
+    lower = _floor(start, interval)
+    while lower <= end:
+        upper = _next(lower, interval)
+        suffix = f'y{lower.year}' if interval == 'year' else f'y{lower.year}q{(lower.month - 1) // 3 + 1}'
+        bounds.append((suffix, lower, upper))
+        lower = upper
+    return bounds
+
+
+def is_partitioned(cursor, table):
+    cursor.execute("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s", [table])
+    return cursor.fetchone() is not None
+
+
+def list_partitions(cursor, table):
+    """[(name, lower or None, upper or None), ...]; the default partition has no bounds."""
+    cursor.execute("""
+        SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class parent ON parent.oid = i.inhparent
+        WHERE parent.relname = %s
+    """, [table])
+    partitions = []
+    for name, bound in cursor.fetchall():
+        match = re_bound.search(bound)
+        if match is None: # DEFAULT
+            partitions.append((name, None, None))
+            continue
+        lower = datetime.datetime.fromisoformat(match.group(1)) if match.group(1) else None
+        partitions.append((name, lower, datetime.datetime.fromisoformat(match.group(2))))
+    return partitions
+
+
+def convert_to_partitioned(cursor, table, interval, until):
+    """Swap `table` for a range-partitioned copy holding the same rows. Run inside a transaction."""
+    legacy = f'{table}_legacy'
+    sequence = f'{table}_pid_seq'
+
+    # Capture secondary indexes and outbound foreign keys before the legacy table goes away
+    cursor.execute("""
+        SELECT indexdef FROM pg_indexes
+        WHERE tablename = %s AND indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u')
+        )
+    """, [table, table])
+    index_defs = [row[0] for row in cursor.fetchall()]
+    cursor.execute("""
+        SELECT conname, pg_get_constraintdef(oid), confrelid::regclass::text
+        FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'
+    """, [table])
+    foreign_keys = cursor.fetchall()
+
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    cursor.execute(f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE (created_at)')
+    cursor.execute(f'CREATE SEQUENCE "{sequence}" OWNED BY "{table}".id')
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN id SET DEFAULT nextval(\'"{sequence}"\')')
+    cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY (id, created_at)')
+    cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+
+    # Partitions first, so the copy lands in them rather than in the default partition
+    cursor.execute(f'SELECT min(created_at) FROM "{legacy}"')
+    earliest = cursor.fetchone()[0] or until
+    ensure_partitions(cursor, table, interval, earliest, until)
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+    cursor.execute(f'SELECT setval(\'"{sequence}"\', COALESCE((SELECT max(id) FROM "{table}"), 0) + 1, false)')
+    cursor.execute(f'DROP TABLE "{legacy}" CASCADE') # Also drops foreign keys pointing at it
+
+    for index_def in index_defs:
+        cursor.execute(index_def) # Captured before the rename, so it already names the new parent
+    for name, definition, referenced in foreign_keys:
+        if is_partitioned(cursor, referenced.strip('"')):
+            continue # Postgres can't reference a partitioned table by id alone
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+
+
+def ensure_partitions(cursor, table, interval, start, end, tablespace=None):
+    """Create missing partitions for start..end, moving any matching rows out of the default partition."""
+    existing = list_partitions(cursor, table)
+    taken = [(lower, upper) for _, lower, upper in existing if upper is not None]
+    created = []
+    for suffix, lower, upper in partition_bounds(interval, start, end):
+        if any((lo is None or lo < upper) and lower < up for lo, up in taken):
+            continue # Covered by an existing (or archive) partition
+        name = f'{table}_{suffix}'
+        location = f' TABLESPACE "{tablespace}"' if tablespace else ''
+        cursor.execute(f'SELECT 1 FROM "{table}_default" WHERE created_at >= %s AND created_at < %s LIMIT 1', [lower, upper])
+        if cursor.fetchone():
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{table}_default"')
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s){location}', [lower, upper])
+            cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{table}_default" WHERE created_at >= %s AND created_at < %s', [lower, upper])
+            cursor.execute(f'DELETE FROM "{table}_default" WHERE created_at >= %s AND created_at < %s', [lower, upper])
+            cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{table}_default" DEFAULT')
+        else:
+            cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" FOR VALUES FROM (%s) TO (%s){location}', [lower, upper])
+        created.append(name)
+    return created
+
+
+def archive_partitions(cursor, table, before, tablespace=None):
+    """Fold whole partitions ending on or before `before` into `<table>_archive`. Returns the names folded in."""
+    archive = f'{table}_archive'
+    partitions = list_partitions(cursor, table)
+    old_archive = next((p for p in partitions if p[0] == archive), None)
+    folding = [p for p in partitions if p[0] != archive and p[2] is not None and p[2] <= before]
+    if not folding:
+        return []
+
+    upper = max([p[2] for p in folding] + ([old_archive[2]] if old_archive else []))
+    sources = [name for name, _, _ in folding]
+    if old_archive:
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{archive}"')
+        cursor.execute(f'ALTER TABLE "{archive}" RENAME TO "{archive}_old"')
+        sources.append(f'{archive}_old')
+    for name, _, _ in folding:
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+
+    location = f' TABLESPACE "{tablespace}"' if tablespace else ''
+    cursor.execute(f'CREATE TABLE "{archive}" PARTITION OF "{table}" FOR VALUES FROM (MINVALUE) TO (%s){location}', [upper])
+    for source in sources:
+        cursor.execute(f'INSERT INTO "{archive}" SELECT * FROM "{source}"')
+        cursor.execute(f'DROP TABLE "{source}"')
+    return [name for name, _, _ in folding]
@@ -0,0 +1,31 @@
+# D:\GrowthFlow\feedback_app\rendering.py
+
+import html
+
+from django.utils.html import escape, linebreaks, strip_tags
+
+try:
+    import markdown
+    import nh3
+except ImportError:
+    markdown = None
+    print("Markdown/nh3 not installed. Markdown comments will be rendered as plain text.")
+
+ALLOWED_TAGS = {
+    'p', 'br', 'strong', 'em', 'code', 'pre', 'blockquote', 'ul', 'ol', 'li',
+    'h1', 'h2', 'h3', 'h4', 'hr', 'a',
+}
+ALLOWED_ATTRIBUTES = {'a': {'href', 'title'}}
+
+
+def render_comment_html(content, is_markdown):
+    """Sanitized HTML for a comment body; Markdown is only interpreted when flagged."""
+    if is_markdown and markdown is not None:
+        rendered = markdown.markdown(content, extensions=['fenced_code', 'sane_lists'])
+        return nh3.clean(rendered, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES, link_rel='noopener noreferrer')
+    return linebreaks(escape(content))
+
+
+def html_to_text(rendered):
+    """Plain text of rendered HTML, for outputs like the PDF export that can't show markup."""
+    return html.unescape(strip_tags(rendered)).strip()
@@ -0,0 +1,54 @@
+# D:\GrowthFlow\feedback_app\routers.py
+
+"""
+Read-replica routing.
+
+ReplicaRoutingMiddleware marks safe-method requests (lists, manager-summary,
+exports) as allowed to read from a replica in settings.DATABASE_REPLICAS. A
+user who wrote within REPLICA_STICKINESS_SECONDS stays on the primary so they
+read their own writes. Everything outside such a request (management commands,
+background work, transactions) uses the primary.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Send this user's reads to the primary for the stickiness window."""
+    if user_id is not None:
+        cache.set(_pin_key(user_id), True, timeout=settings.REPLICA_STICKINESS_SECONDS)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(_pin_key(user_id), False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = getattr(settings, 'DATABASE_REPLICAS', [])
+        if not replicas or not replica_reads_allowed.get():
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS # Reads inside a transaction must see its writes
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        replica_reads_allowed.set(False) # Anything read after a write in this request sees it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True # Replicas hold the same data as the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
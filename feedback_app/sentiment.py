@@ -0,0 +1,103 @@
+# D:\GrowthFlow\feedback_app\sentiment.py
+
+"""
+Offline, CPU-only sentiment labelling for Feedback.
+
+A small lexicon scorer (negation- and intensifier-aware) run over batches of
+rows by `manage.py classify_sentiment`. Negation and intensifiers make scoring a
+left-to-right pass over each text, so batches aren't vectorized numerically (the
+project has no numpy stack); instead `classify_batch` scores each distinct text
+in a batch once, and the command writes one UPDATE per label. Rows a manager labelled by hand
+(sentiment_source='manager') are never overwritten; editing the text of a
+classifier-labelled row clears the label so the next batch relabels it.
+"""
+
+import re
+
+POSITIVE = 'Positive'
+NEUTRAL = 'Neutral'
+NEEDS_IMPROVEMENT = 'Needs Improvement'
+
+POSITIVE_WORDS = frozenset("""
+    excellent outstanding great good strong strongly impressive exceptional reliable reliably dependable
+    consistently proactive helpful generous generously clear clearly thorough thoroughly ownership
+    exceeded exceeds excels excelled effective effectively efficient collaborative supportive mentors
+    mentored creative insightful organized skilled talented delivers delivered improved well-tested
+    thoughtful valuable initiative quality accurate respected trusted confident motivated
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+    poor poorly weak late missed misses missing lacks lacking lack struggles struggled struggle
+    inconsistent inconsistently unclear careless sloppy delays delayed errors mistakes bugs failed
+    fails failure unreliable disorganized slow rushed confusing defensive dismissive blocked blocker
+    overdue incomplete avoid avoids difficult problem problems issues concern concerns worse
+""".split())
+
+# Softer cues that something should change; typical of areas_to_improve
+IMPROVEMENT_WORDS = frozenset("""
+    could should would benefit needs need improve improving consider try earlier more better
+""".split())
+
+NEGATIONS = frozenset("not no never without hardly rarely".split())
+INTENSIFIERS = {'very': 1.5, 'extremely': 2.0, 'really': 1.5, 'always': 1.5, 'often': 1.25}
+
+re_token = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+
+POSITIVE_THRESHOLD = 1.0
+NEGATIVE_THRESHOLD = -1.0
+IMPROVEMENT_WEIGHT = 0.25
+
+# Every lexicon word's weight, so scoring does one dict lookup per token
+POLARITY = {
+    **{word: -IMPROVEMENT_WEIGHT for word in IMPROVEMENT_WORDS},
+    **{word: -1.0 for word in NEGATIVE_WORDS},
+    **{word: 1.0 for word in POSITIVE_WORDS},
+}
+
+
+def score_text(text):
+    """Net polarity of one text: positive words minus negative ones, with negation and intensifiers."""
+    score = 0.0
+    negate_for = 0
+    boost = 1.0
+    for token in re_token.findall((text or '').lower()):
+        if token in NEGATIONS or token.endswith("n't"):
+            negate_for = 3 # Flips the next few words: "not very clear"
+            continue
+        if token in INTENSIFIERS:
+            boost = INTENSIFIERS[token]
+            continue
+        polarity = POLARITY.get(token, 0.0)
+        if polarity:
+            score += polarity * boost * (-1 if negate_for else 1)
+            boost = 1.0
+        if negate_for:
+            negate_for -= 1
+    return score
+
+
+def _label(score):
+    if score >= POSITIVE_THRESHOLD:
+        return POSITIVE
+    if score <= NEGATIVE_THRESHOLD:
+        return NEEDS_IMPROVEMENT
+    return NEUTRAL
+
+
+def classify(strengths, areas_to_improve):
+    return _label(score_text(strengths) + score_text(areas_to_improve))
+
+
+def classify_batch(rows):
+    """
+    Labels for an iterable of (pk, strengths, areas_to_improve); returns {pk: sentiment}.
+    Each distinct text is scored once per batch: templated and pasted feedback repeats a lot.
+    """
+    scores = {}
+    labels = {}
+    for pk, strengths, areas in rows:
+        for text in (strengths, areas):
+            if text not in scores:
+                scores[text] = score_text(text)
+        labels[pk] = _label(scores[strengths] + scores[areas])
+    return labels
@@ -1,8 +1,12 @@
 
 
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .metrics import TimedRepresentationMixin
+from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, ReviewCycle, Dossier
+from .tokens import is_revoked, revocations_are_shared
 
 
 
@@ -21,31 +25,72 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         return token
 
 
-
-class UserSerializer(serializers.ModelSerializer):
+class StatelessTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh without loading the user: the signed refresh token already carries
+    the claims copied into the new access token. Deactivated users are caught by
+    the cache-based revocation in tokens.py instead of a per-refresh SELECT,
+    provided that cache is shared and persistent.
+    """
+    def validate(self, attrs):
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            return super().validate(attrs) # Rotation tracks outstanding tokens in the database anyway
+        if not revocations_are_shared():
+            return super().validate(attrs) # A per-process cache would miss revocations made elsewhere
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        if user_id is None or is_revoked(user_id, refresh.payload.get('iat', 0)):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        return {'access': str(refresh.access_token)}
+
+
+class UserSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         # Include all fields relevant for displaying user info and for managers to pick employees
-        fields = ['id', 'username', 'email', 'role', 'manager', 'is_superuser']
-        read_only_fields = ['is_superuser'] # is_superuser should not be changeable via this serializer
+        fields = ['id', 'username', 'email', 'role', 'manager', 'is_superuser',
+                  'feedback_received_count', 'pending_ack_count', 'open_request_count']
+        read_only_fields = ['is_superuser', # is_superuser should not be changeable via this serializer
+                            'feedback_received_count', 'pending_ack_count', 'open_request_count']
+
+
+
+class EmployeeStatsSerializer(UserSerializer):
+    # Read from annotations added by UserViewSet.list_employees
+    last_feedback_at = serializers.DateTimeField(read_only=True)
+    sentiment_counts = serializers.SerializerMethodField()
 
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['last_feedback_at', 'sentiment_counts']
 
+    def get_sentiment_counts(self, obj):
+        return {
+            'Positive': obj.positive_count,
+            'Neutral': obj.neutral_count,
+            'Needs Improvement': obj.needs_improvement_count,
+        }
 
-class CommentSerializer(serializers.ModelSerializer):
+
+class CommentSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     author_username = serializers.ReadOnlyField(source='author.username')
 
     class Meta:
         model = Comment
-        fields = ['id', 'feedback', 'author', 'author_username', 'content', 'is_markdown', 'created_at', 'updated_at']
-        read_only_fields = ['author', 'created_at', 'updated_at'] # Author set by view
+        fields = ['id', 'feedback', 'author', 'author_username', 'content', 'is_markdown', 'content_html',
+                  'created_at', 'updated_at']
+        read_only_fields = ['author', 'content_html', 'created_at', 'updated_at'] # Author set by view
 
+    def validate_feedback(self, value):
+        if self.instance is not None and value != self.instance.feedback:
+            raise serializers.ValidationError("A comment cannot be moved to another feedback.")
+        return value
 
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class FeedbackSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     manager_username = serializers.ReadOnlyField(source='manager.username')
     employee_username = serializers.ReadOnlyField(source='employee.username')
-    # Nested serializer for comments
-    comments = CommentSerializer(many=True, read_only=True) # Feedback can have multiple comments
+    # Only the latest few comments are embedded; the full thread is paged at /feedback/{id}/comments/
+    comments = serializers.SerializerMethodField()
 
     employee = serializers.PrimaryKeyRelatedField(
         queryset=CustomUser.objects.filter(role='employee')
@@ -56,13 +101,34 @@ class FeedbackSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'manager', 'manager_username', 'employee', 'employee_username',
             'strengths', 'areas_to_improve', 'sentiment', 'is_acknowledged',
-            'created_at', 'updated_at', 'comments' # Include comments field
+            'created_at', 'updated_at', 'comments', 'comment_count' # Include comments field
         ]
-        read_only_fields = ['manager', 'is_acknowledged', 'created_at', 'updated_at']
+        read_only_fields = ['manager', 'is_acknowledged', 'comment_count', 'created_at', 'updated_at']
+
+    LATEST_COMMENTS = 3
+
+    def validate(self, attrs):
+        if 'sentiment' in attrs:
+            attrs['sentiment'] = attrs['sentiment'] or None
+            if self.instance is None or attrs['sentiment'] != self.instance.sentiment:
+                attrs['sentiment_source'] = 'manager' if attrs['sentiment'] else None
+        elif self.instance is not None and self.instance.sentiment_source == 'classifier' \
+                and {'strengths', 'areas_to_improve'} & attrs.keys():
+            # Stale label; the next `classify_sentiment` batch relabels the edited text
+            attrs['sentiment'] = attrs['sentiment_source'] = None
+        return attrs
+
+    def get_comments(self, obj):
+        # FeedbackViewSet prefetches `latest_comments`; fall back for freshly created rows
+        latest = getattr(obj, 'latest_comments', None)
+        if latest is None:
+            latest = list(obj.comments.select_related('author').order_by('-created_at', '-id')[:self.LATEST_COMMENTS])
+        latest = sorted(latest, key=lambda c: (c.created_at, c.id)) # Chronological, like the thread
+        return CommentSerializer(latest, many=True, context=self.context).data
 
 
 # --- NEW SERIALIZER: FeedbackRequestSerializer ---
-class FeedbackRequestSerializer(serializers.ModelSerializer):
+class FeedbackRequestSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     requester_username = serializers.ReadOnlyField(source='requester.username')
     target_manager_username = serializers.ReadOnlyField(source='target_manager.username')
 
@@ -74,7 +140,7 @@ class FeedbackRequestSerializer(serializers.ModelSerializer):
 
 
 
-class PeerFeedbackSerializer(serializers.ModelSerializer):
+class PeerFeedbackSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
     # Only display giver username if not anonymous
     giver_username = serializers.SerializerMethodField()
     receiver_username = serializers.ReadOnlyField(source='receiver.username')
@@ -93,6 +159,30 @@ class PeerFeedbackSerializer(serializers.ModelSerializer):
     def validate(self, data):
         # Prevent self-feedback for peer feedback
         request = self.context.get('request')
-        if request and request.user == data['receiver']:
+        receiver = data.get('receiver', getattr(self.instance, 'receiver', None)) # Absent from partial updates
+        if request and request.user == receiver:
             raise serializers.ValidationError("You cannot give peer feedback to yourself.")
-        return data
\ No newline at end of file
+        return data
+
+
+# --- NEW SERIALIZERS: Review cycles and dossiers ---
+class ReviewCycleSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ReviewCycle
+        fields = ['id', 'name', 'starts_at', 'ends_at', 'status', 'created_by', 'created_at', 'built_at']
+        read_only_fields = ['status', 'created_by', 'created_at', 'built_at']
+
+    def validate(self, data):
+        starts_at = data.get('starts_at', getattr(self.instance, 'starts_at', None))
+        ends_at = data.get('ends_at', getattr(self.instance, 'ends_at', None))
+        if starts_at and ends_at and ends_at <= starts_at:
+            raise serializers.ValidationError("A review cycle must end after it starts.")
+        return data
+
+
+class DossierSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    # `data` is the payload precomputed in dossiers.py, served without touching live tables
+    class Meta:
+        model = Dossier
+        fields = ['id', 'cycle', 'employee', 'built_at', 'data']
+        read_only_fields = fields
@@ -0,0 +1,262 @@
+# D:\GrowthFlow\feedback_app\signals.py
+
+import datetime
+
+from django.conf import settings
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .counters import adjust_feedback, adjust_user
+from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, Tombstone
+from .notifications import publish
+from .outbox import enqueue
+from .tokens import revoke_tokens
+
+
+def _touched(update_fields, name):
+    # update_fields is None for full saves, so fall back to "maybe touched"
+    return update_fields is None or name in update_fields
+
+
+@receiver(post_save, sender=Feedback)
+def notify_feedback(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        publish(
+            [instance.employee_id, instance.employee.manager_id],
+            'feedback.created', feedback=instance.id,
+        )
+    elif instance.is_acknowledged and _touched(update_fields, 'is_acknowledged'):
+        publish([instance.manager_id], 'feedback.acknowledged', feedback=instance.id)
+
+
+@receiver(post_save, sender=Comment)
+def notify_comment(sender, instance, created, **kwargs):
+    if not created:
+        return
+    feedback = instance.feedback
+    recipients = {feedback.manager_id, feedback.employee_id} - {instance.author_id}
+    publish(recipients, 'comment.created', comment=instance.id, feedback=feedback.id)
+
+
+@receiver(post_save, sender=FeedbackRequest)
+def notify_feedback_request(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        publish(
+            [instance.target_manager_id, instance.requester.manager_id],
+            'feedback_request.created', feedback_request=instance.id,
+        )
+    elif instance.is_fulfilled and _touched(update_fields, 'is_fulfilled'):
+        publish([instance.requester_id], 'feedback_request.fulfilled', feedback_request=instance.id)
+
+
+@receiver(post_save, sender=PeerFeedback)
+def notify_peer_feedback(sender, instance, created, **kwargs):
+    if created:
+        # Never leak the giver of anonymous feedback through the event payload
+        publish([instance.receiver_id], 'peer_feedback.created', peer_feedback=instance.id)
+
+
+# --- Tombstones for delta sync ---
+TOMBSTONE_RESOURCES = {
+    Feedback: 'feedback',
+    Comment: 'comment',
+    FeedbackRequest: 'feedbackrequest',
+    PeerFeedback: 'peerfeedback',
+}
+
+
+# The foreign keys that decide who can list a row (see each viewset's get_queryset)
+AUDIENCE_FIELDS = {
+    Feedback: ('manager_id', 'employee_id'),
+    Comment: ('author_id', 'feedback_id'),
+    FeedbackRequest: ('requester_id', 'target_manager_id'),
+    PeerFeedback: ('giver_id', 'receiver_id'),
+}
+
+
+def _audience_key(sender, instance):
+    # Read from __dict__ so deferred fields stay unloaded
+    return tuple(instance.__dict__.get(name) for name in AUDIENCE_FIELDS[sender])
+
+
+def _managers_of(*user_ids):
+    return set(CustomUser.objects.filter(pk__in=[uid for uid in user_ids if uid]).values_list('manager_id', flat=True))
+
+
+def audience(sender, key):
+    """Ids of the non-superusers who can list a row of `sender` with these AUDIENCE_FIELDS values."""
+    if sender is Feedback:
+        manager_id, employee_id = key
+        users = {manager_id, employee_id} | _managers_of(employee_id)
+    elif sender is Comment:
+        author_id, feedback_id = key
+        thread = Feedback.objects.filter(pk=feedback_id).values_list('manager_id', 'employee_id').first()
+        users = {author_id} | (audience(Feedback, thread) if thread else set())
+    elif sender is FeedbackRequest:
+        requester_id, target_manager_id = key
+        users = {requester_id, target_manager_id} | _managers_of(requester_id)
+    else:
+        giver_id, receiver_id = key
+        users = {giver_id, receiver_id} | _managers_of(giver_id, receiver_id)
+    users.discard(None)
+    return users
+
+
+def _tombstones(sender, instance, user_ids):
+    return [Tombstone(resource=TOMBSTONE_RESOURCES[sender], object_id=instance.pk, visible_to=uid) for uid in user_ids]
+
+
+def record_tombstone(sender, instance, **kwargs):
+    users = audience(sender, _audience_key(sender, instance))
+    Tombstone.objects.bulk_create(_tombstones(sender, instance, [None, *users]))
+
+
+def snapshot_audience(sender, instance, **kwargs):
+    instance._audience = _audience_key(sender, instance)
+
+
+def record_departures(sender, instance, created, **kwargs):
+    # A row moved to another employee/feedback: users who could list it before but can't now drop it
+    old, new = getattr(instance, '_audience', None), _audience_key(sender, instance)
+    instance._audience = new
+    if created or old is None or old == new:
+        return
+    left = audience(sender, old) - audience(sender, new)
+    if left:
+        Tombstone.objects.bulk_create(_tombstones(sender, instance, left))
+
+
+def tombstone_horizon():
+    """Deletions before this moment may have been purged, so sync tokens older than it can't be served a delta."""
+    return timezone.now() - datetime.timedelta(days=getattr(settings, 'TOMBSTONE_RETENTION_DAYS', 30))
+
+
+def purge_tombstones():
+    """Delete tombstones past the retention window. Returns how many were deleted."""
+    return Tombstone.objects.filter(deleted_at__lt=tombstone_horizon()).delete()[0]
+
+
+for _model in TOMBSTONE_RESOURCES:
+    post_delete.connect(record_tombstone, sender=_model, dispatch_uid=f'tombstone-{_model.__name__}')
+    post_init.connect(snapshot_audience, sender=_model, dispatch_uid=f'audience-{_model.__name__}')
+    post_save.connect(record_departures, sender=_model, dispatch_uid=f'departures-{_model.__name__}')
+
+
+# Changing a user's manager or role changes which rows they (and the old and new manager) can list
+# without touching those rows, so neither updated_at nor tombstones can express it
+@receiver(post_init, sender=CustomUser)
+def snapshot_sync_scope(sender, instance, **kwargs):
+    instance._sync_scope = tuple(instance.__dict__.get(name) for name in ('manager_id', 'role', 'is_superuser'))
+
+
+@receiver(post_save, sender=CustomUser)
+def reset_sync_scope(sender, instance, created, **kwargs):
+    old_manager, old_role, old_superuser = getattr(instance, '_sync_scope', (None, None, None))
+    instance._sync_scope = (instance.manager_id, instance.role, instance.is_superuser)
+    if created:
+        return
+    affected = set()
+    if (old_role, old_superuser) != (instance.role, instance.is_superuser):
+        affected.add(instance.pk)
+    if old_manager != instance.manager_id:
+        affected |= {old_manager, instance.manager_id}
+    affected.discard(None)
+    if affected:
+        CustomUser.objects.filter(pk__in=affected).update(sync_reset_at=timezone.now())
+
+
+# --- Transactional outbox ---
+# Enqueued inside the write's transaction; handlers in outbox.py run in `drain_outbox`
+OUTBOX_TOPICS = {
+    Feedback: 'feedback',
+    Comment: 'comment',
+    FeedbackRequest: 'feedback_request',
+    PeerFeedback: 'peer_feedback',
+}
+
+
+def outbox_saved(sender, instance, created, update_fields=None, **kwargs):
+    action = 'created' if created else 'updated'
+    fields = sorted(update_fields) if update_fields is not None else None
+    enqueue(f'{OUTBOX_TOPICS[sender]}.{action}', id=instance.pk, fields=fields)
+
+
+def outbox_deleted(sender, instance, **kwargs):
+    enqueue(f'{OUTBOX_TOPICS[sender]}.deleted', id=instance.pk)
+
+
+for _model in OUTBOX_TOPICS:
+    post_save.connect(outbox_saved, sender=_model, dispatch_uid=f'outbox-saved-{_model.__name__}')
+    post_delete.connect(outbox_deleted, sender=_model, dispatch_uid=f'outbox-deleted-{_model.__name__}')
+
+
+# --- Denormalized counters ---
+# Snapshot the counted fields as loaded, so post_save can tell what changed
+@receiver(post_init, sender=Feedback)
+def snapshot_feedback(sender, instance, **kwargs):
+    instance._counted = (instance.employee_id, instance.is_acknowledged)
+
+
+@receiver(post_init, sender=FeedbackRequest)
+def snapshot_feedback_request(sender, instance, **kwargs):
+    instance._counted = (instance.requester_id, instance.is_fulfilled)
+
+
+@receiver(post_init, sender=Comment)
+def snapshot_comment(sender, instance, **kwargs):
+    instance._counted = instance.feedback_id
+
+
+@receiver(post_save, sender=Feedback)
+def count_feedback(sender, instance, created, **kwargs):
+    old_employee, old_acknowledged = (None, True) if created else instance._counted
+    if old_employee != instance.employee_id:
+        adjust_user(old_employee, received=-1, pending=-int(not old_acknowledged))
+        adjust_user(instance.employee_id, received=1, pending=int(not instance.is_acknowledged))
+    elif old_acknowledged != instance.is_acknowledged:
+        adjust_user(instance.employee_id, pending=-1 if instance.is_acknowledged else 1)
+    instance._counted = (instance.employee_id, instance.is_acknowledged)
+
+
+@receiver(post_delete, sender=Feedback)
+def uncount_feedback(sender, instance, **kwargs):
+    adjust_user(instance.employee_id, received=-1, pending=-int(not instance.is_acknowledged))
+
+
+@receiver(post_save, sender=FeedbackRequest)
+def count_feedback_request(sender, instance, created, **kwargs):
+    old_requester, old_fulfilled = (None, True) if created else instance._counted
+    if old_requester != instance.requester_id:
+        adjust_user(old_requester, open_requests=-int(not old_fulfilled))
+        adjust_user(instance.requester_id, open_requests=int(not instance.is_fulfilled))
+    elif old_fulfilled != instance.is_fulfilled:
+        adjust_user(instance.requester_id, open_requests=-1 if instance.is_fulfilled else 1)
+    instance._counted = (instance.requester_id, instance.is_fulfilled)
+
+
+@receiver(post_delete, sender=FeedbackRequest)
+def uncount_feedback_request(sender, instance, **kwargs):
+    adjust_user(instance.requester_id, open_requests=-int(not instance.is_fulfilled))
+
+
+@receiver(post_save, sender=Comment)
+def count_comment(sender, instance, created, **kwargs):
+    old_feedback = None if created else instance._counted
+    if old_feedback != instance.feedback_id: # Created, or moved to another feedback (e.g. in the admin)
+        adjust_feedback(old_feedback, comments=-1)
+        adjust_feedback(instance.feedback_id, comments=1)
+    instance._counted = instance.feedback_id
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_comment(sender, instance, **kwargs):
+    adjust_feedback(instance.feedback_id, comments=-1)
+
+
+# --- Token revocation ---
+@receiver(post_save, sender=CustomUser)
+def revoke_deactivated_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # Refresh skips the user lookup (StatelessTokenRefreshSerializer), so deactivation must reach the cache
+    if not instance.is_active and _touched(update_fields, 'is_active'):
+        revoke_tokens(instance.pk)
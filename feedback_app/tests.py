@@ -1,3 +1,1100 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import io
+import time
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, router, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .middleware import CompressionMiddleware, ReplicaRoutingMiddleware
+from . import outbox, sentiment
+from .models import (
+    CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, OutboxEvent, ReviewCycle, Dossier, Tombstone,
+)
+from .notifications import broker
+from .org_import import hash_passwords, import_users, read_rows
+from .partitioning import PARTITIONED_TABLES, is_partitioned, list_partitions, partition_bounds
+from .throttling import CostClassThrottle
+
+
+class PartialUpdateWriteTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee,
+            strengths='Great communicator. ' * 200,
+            areas_to_improve='Time management. ' * 200,
+            sentiment='Neutral',
+        )
+        self.client = APIClient()
+
+    def _updates(self, queries, table='feedback_app_feedback'):
+        return [q['sql'] for q in queries if q['sql'].startswith(f'UPDATE "{table}"')]
+
+    def test_patch_writes_only_changed_columns(self):
+        self.client.force_authenticate(self.manager)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f'/api/feedback/{self.feedback.id}/', {'sentiment': 'Positive'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        updates = self._updates(ctx.captured_queries)
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"sentiment"', updates[0])
+        self.assertIn('"updated_at"', updates[0])
+        self.assertNotIn('"strengths"', updates[0])
+        self.assertNotIn('"areas_to_improve"', updates[0])
+        self.feedback.refresh_from_db()
+        self.assertEqual(self.feedback.sentiment, 'Positive')
+
+    def test_patch_with_unchanged_values_skips_write(self):
+        self.client.force_authenticate(self.manager)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f'/api/feedback/{self.feedback.id}/',
+                {'sentiment': 'Neutral', 'employee': self.employee.id}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._updates(ctx.captured_queries), [])
+
+    def test_acknowledge_writes_only_flag(self):
+        self.client.force_authenticate(self.employee)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(
+                f'/api/feedback/{self.feedback.id}/acknowledge/', {'is_acknowledged': True}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        updates = self._updates(ctx.captured_queries)
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"is_acknowledged"', updates[0])
+        self.assertNotIn('"strengths"', updates[0])
+
+    def test_peer_feedback_patch_without_receiver(self):
+        peer = PeerFeedback.objects.create(giver=self.employee, receiver=self.manager, feedback_text='Helpful.')
+        self.client.force_authenticate(self.employee)
+        response = self.client.patch(f'/api/peer-feedback/{peer.id}/', {'feedback_text': 'Very helpful.'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+
+class NotificationFanOutTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def _subscribe(self, user):
+        subscription = broker.subscribe(user.id, loop=self.loop)
+        self.addCleanup(broker.unsubscribe, user.id, subscription)
+        return subscription[1]
+
+    def _drain(self, queue):
+        self.loop.run_until_complete(asyncio.sleep(0))
+        events = []
+        while not queue.empty():
+            events.append(queue.get_nowait())
+        return events
+
+    def test_feedback_lifecycle_reaches_involved_users(self):
+        employee_queue = self._subscribe(self.employee)
+        manager_queue = self._subscribe(self.manager)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback = Feedback.objects.create(
+                manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+            )
+        self.assertEqual(
+            self._drain(employee_queue), [{'type': 'feedback.created', 'feedback': feedback.id}]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            feedback.is_acknowledged = True
+            feedback.save(update_fields=['is_acknowledged', 'updated_at'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(feedback=feedback, author=self.employee, content='Thanks!')
+
+        manager_events = [e['type'] for e in self._drain(manager_queue)]
+        self.assertEqual(manager_events, ['feedback.created', 'feedback.acknowledged', 'comment.created'])
+        self.assertEqual(self._drain(employee_queue), []) # Authors aren't notified of their own comments
+
+
+    async def test_stream_delivers_events_under_asgi(self):
+        token = AccessToken.for_user(self.employee)
+        response = await self.async_client.get(f'/api/notifications/stream/?token={token}')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        try:
+            self.assertEqual(await anext(stream), b'retry: 5000\n\n') # Subscribed from here on
+            broker.deliver([self.employee.id], {'type': 'feedback.created', 'feedback': 1})
+            event = await asyncio.wait_for(anext(stream), timeout=5)
+        finally:
+            await stream.aclose()
+        self.assertEqual(event, b'event: feedback.created\ndata: {"type": "feedback.created", "feedback": 1}\n\n')
+
+    async def test_stream_rejects_deactivated_user(self):
+        token = AccessToken.for_user(self.employee) # Still unexpired
+        await CustomUser.objects.filter(pk=self.employee.pk).aupdate(is_active=False)
+        response = await self.async_client.get(f'/api/notifications/stream/?token={token}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_refuses_wsgi(self):
+        token = AccessToken.for_user(self.employee)
+        response = self.client.get(f'/api/notifications/stream/?token={token}')
+        self.assertEqual(response.status_code, 501)
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.old = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        self.doomed = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    @override_settings(DELTA_SYNC_OVERLAP_SECONDS=0)
+    def test_returns_only_changes_and_deletions_since_token(self):
+        token = self.client.get('/api/feedback/')['X-Sync-Token']
+
+        fresh = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        doomed_id = self.doomed.id
+        self.doomed.delete()
+
+        response = self.client.get('/api/feedback/', {'updated_since': token})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [fresh.id])
+        self.assertEqual(response.data['deleted'], [doomed_id])
+        self.assertEqual(response['X-Sync-Token'], response.data['sync_token'])
+
+    def test_rejects_malformed_timestamp(self):
+        response = self.client.get('/api/feedback/', {'updated_since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+        for impossible in ('2020-13-01T00:00:00', '2020-02-30T00:00:00Z', '2020-01-01T00:00:00+99:00'):
+            response = self.client.get('/api/feedback/', {'updated_since': impossible})
+            self.assertEqual(response.status_code, 400, impossible)
+
+    def test_token_covers_writes_committed_after_it(self):
+        token = self.client.get('/api/feedback/')['X-Sync-Token']
+        # Saved (and stamped) just before the token was issued, committed only afterwards
+        Feedback.objects.filter(pk=self.old.pk).update(updated_at=timezone.now() - datetime.timedelta(seconds=5))
+        response = self.client.get('/api/feedback/', {'updated_since': token})
+        self.assertIn(self.old.id, [row['id'] for row in response.data['results']])
+
+    def test_deletions_are_scoped_to_the_caller(self):
+        token = self.client.get('/api/feedback/')['X-Sync-Token']
+        stranger = CustomUser.objects.create_user(username='other', password='pw', role='manager')
+        doomed_id = self.doomed.id
+        self.doomed.delete()
+
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get('/api/feedback/', {'updated_since': token}).data['deleted'], [])
+        self.client.force_authenticate(self.manager)
+        self.assertEqual(self.client.get('/api/feedback/', {'updated_since': token}).data['deleted'], [doomed_id])
+
+    @override_settings(DELTA_SYNC_OVERLAP_SECONDS=0)
+    def test_scope_changes_reach_old_and_new_manager(self):
+        new_manager = CustomUser.objects.create_user(username='mgr2', password='pw', role='manager')
+        token = self.client.get('/api/feedback/')['X-Sync-Token']
+        self.employee.manager = new_manager
+        self.employee.save()
+        for user in (new_manager, self.manager, self.employee): # As each request's authentication would
+            user.refresh_from_db()
+
+        self.client.force_authenticate(new_manager)
+        response = self.client.get('/api/feedback/', {'updated_since': token})
+        self.assertTrue(response.data['reset'])
+        self.assertEqual({row['id'] for row in response.data['results']}, {self.old.id, self.doomed.id})
+        self.client.force_authenticate(self.manager)
+        response = self.client.get('/api/feedback/', {'updated_since': token})
+        self.assertTrue(response.data['reset']) # Still gave this feedback, so it stays in scope
+        self.client.force_authenticate(self.employee)
+        self.assertFalse(self.client.get('/api/feedback/', {'updated_since': token}).data['reset'])
+
+    def test_row_moved_out_of_scope_is_tombstoned(self):
+        other = CustomUser.objects.create_user(username='emp2', password='pw', role='employee', manager=self.manager)
+        self.client.force_authenticate(self.employee)
+        token = self.client.get('/api/feedback/')['X-Sync-Token']
+        self.client.force_authenticate(self.manager)
+        self.client.patch(f'/api/feedback/{self.old.id}/', {'employee': other.id}, format='json')
+
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get('/api/feedback/', {'updated_since': token}).data['deleted'], [self.old.id])
+
+    @override_settings(TOMBSTONE_RETENTION_DAYS=30)
+    def test_tombstones_are_purged_and_older_tokens_resync(self):
+        self.doomed.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=31))
+        call_command('drain_outbox', concurrency=1, stdout=io.StringIO())
+        self.assertFalse(Tombstone.objects.exists())
+
+        stale = (timezone.now() - datetime.timedelta(days=40)).isoformat()
+        response = self.client.get('/api/feedback/', {'updated_since': stale})
+        self.assertTrue(response.data['reset']) # Deletions since the token are no longer on record
+        self.assertEqual([row['id'] for row in response.data['results']], [self.old.id])
+        recent = (timezone.now() - datetime.timedelta(days=29)).isoformat()
+        self.assertFalse(self.client.get('/api/feedback/', {'updated_since': recent}).data['reset'])
+
+
+class ConditionalListTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s' * 500, areas_to_improve='a'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def test_matching_etag_short_circuits_to_304(self):
+        etag = self.client.get('/api/feedback/')['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/feedback/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(any('"feedback_app_feedback"."strengths"' in q['sql'] for q in ctx.captured_queries))
+
+    def test_nested_comment_changes_invalidate_etag(self):
+        etag = self.client.get('/api/feedback/')['ETag']
+        Comment.objects.create(feedback=self.feedback, author=self.employee, content='Noted')
+        response = self.client.get('/api/feedback/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_large_payloads_are_compressed(self):
+        response = self.client.get('/api/feedback/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_html_is_never_brotli_compressed(self):
+        fake_brotli = mock.Mock(compress=lambda content, quality: b'br')
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip, br')
+        middleware = CompressionMiddleware(lambda request: None)
+        with mock.patch('feedback_app.middleware.brotli', fake_brotli):
+            json_response = middleware.process_response(request, HttpResponse('{}' * 200, content_type='application/json'))
+            html_response = middleware.process_response(request, HttpResponse('<p>x</p>' * 100, content_type='text/html'))
+        self.assertEqual(json_response['Content-Encoding'], 'br')
+        self.assertEqual(html_response['Content-Encoding'], 'gzip') # Padded against BREACH
+
+
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    @override_settings(THROTTLE_BUCKETS={
+        'default': {'capacity': 100, 'period': 60, 'cost': 1},
+        'summary': {'capacity': 10, 'period': 60, 'cost': 5},
+    })
+    def test_heavy_endpoint_has_its_own_weighted_bucket(self):
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/feedback/manager-summary/').status_code, 200)
+        response = self.client.get('/api/feedback/manager-summary/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        # Cheap endpoints draw from a separate bucket and keep working
+        self.assertEqual(self.client.get('/api/feedback/').status_code, 200)
+
+    @override_settings(THROTTLE_BUCKETS={'default': {'capacity': 2, 'period': 60, 'cost': 1}})
+    def test_bucket_refills_gradually_across_window_boundaries(self):
+        clock = [1019.0] # One second before a 60s boundary
+        with mock.patch.object(CostClassThrottle, 'timer', staticmethod(lambda: clock[0])):
+            statuses = [self.client.get('/api/feedback/').status_code for _ in range(3)]
+            self.assertEqual(statuses, [200, 200, 429])
+            clock[0] = 1021.0 # A fixed window would hand out a fresh budget here
+            self.assertEqual(self.client.get('/api/feedback/').status_code, 429)
+            clock[0] = 1049.0 # 30s refills one token at 2 per 60s
+            statuses = [self.client.get('/api/feedback/').status_code for _ in range(2)]
+            self.assertEqual(statuses, [200, 429])
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_server_timing_and_prometheus_export(self):
+        response = self.client.get('/api/feedback/manager-summary/')
+        self.assertRegex(
+            response['Server-Timing'],
+            r'db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+;desc="\d+ queries", render;dur=',
+        )
+
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        metrics = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret').content.decode()
+        self.assertIn('growthflow_requests_total{endpoint="FeedbackViewSet.manager_summary",method="GET",status="200"}', metrics)
+        self.assertIn('growthflow_db_queries_total{endpoint="FeedbackViewSet.manager_summary"}', metrics)
+
+    def test_metrics_closed_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+
+    def test_serializer_work_is_booked_as_serialization(self):
+        employee = CustomUser.objects.create_user(username='emp', password='pw', role='employee', manager=self.manager)
+        Feedback.objects.create(manager=self.manager, employee=employee, strengths='s', areas_to_improve='a')
+        response = self.client.get('/api/feedback/')
+        metrics = response.wsgi_request.request_metrics
+        self.assertGreater(metrics.serialize_time, 0)
+        self.assertGreater(metrics.render_time, 0)
+        self.assertFalse(metrics.serializing)
+
+    @override_settings(REQUEST_QUERY_BUDGET=1)
+    def test_warns_when_query_budget_exceeded(self):
+        with self.assertLogs('feedback_app.middleware', level='WARNING') as logs:
+            self.client.get('/api/feedback/manager-summary/')
+        self.assertIn('FeedbackViewSet.manager_summary', logs.output[0])
+
+
+class CommentThreadTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        self.comments = [
+            Comment.objects.create(feedback=self.feedback, author=self.employee, content=f'comment {i}')
+            for i in range(25)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def test_feedback_embeds_latest_comments_and_total(self):
+        response = self.client.get(f'/api/feedback/{self.feedback.id}/')
+        self.assertEqual(response.data['comment_count'], 25)
+        self.assertEqual([c['content'] for c in response.data['comments']],
+                         ['comment 22', 'comment 23', 'comment 24'])
+
+    def test_thread_is_cursor_paginated_newest_first(self):
+        first = self.client.get(f'/api/feedback/{self.feedback.id}/comments/')
+        self.assertEqual(len(first.data['results']), 20)
+        self.assertEqual(first.data['results'][0]['content'], 'comment 24')
+
+        second = self.client.get(first.data['next'])
+        self.assertEqual([c['content'] for c in second.data['results']],
+                         [f'comment {i}' for i in range(4, -1, -1)])
+        self.assertIsNone(second.data['next'])
+
+
+class PerformanceContractTests(TestCase):
+    """
+    Query budgets per viewset action. The count for each endpoint must be
+    the same with 10 and 1000 rows in scope (no N+1), stay within its budget,
+    and the seeded request must finish under LATENCY_CEILING_MS.
+    """
+    SMALL, LARGE = 10, 1000
+    LATENCY_CEILING_MS = 3000 # Generous: catches pathological regressions, not CI noise
+
+    # (name, actor, method, path, max queries); {feedback} is a feedback id in scope
+    ENDPOINTS = [
+        ('users list', 'manager', 'get', '/api/users/', 1),
+        ('users me', 'manager', 'get', '/api/users/me/', 1),
+        ('users employees', 'manager', 'get', '/api/users/employees/', 1),
+        ('feedback list (manager)', 'manager', 'get', '/api/feedback/', 4),
+        ('feedback list (employee)', 'employee', 'get', '/api/feedback/', 4),
+        ('feedback detail', 'manager', 'get', '/api/feedback/{feedback}/', 2),
+        ('feedback manager-summary', 'manager', 'get', '/api/feedback/manager-summary/', 4),
+        ('feedback export-pdf', 'manager', 'get', '/api/feedback/{feedback}/export-pdf/', 2),
+        ('comments list', 'manager', 'get', '/api/comments/?feedback={feedback}', 2),
+        ('feedback comment thread', 'manager', 'get', '/api/feedback/{feedback}/comments/', 2),
+        ('feedback-requests list', 'manager', 'get', '/api/feedback-requests/', 2),
+        ('peer-feedback list', 'manager', 'get', '/api/peer-feedback/', 2),
+        # Writes: + outbox INSERT, and SAVEPOINT/RELEASE from AtomicWritesMixin inside the test transaction
+        ('feedback patch', 'manager', 'patch', '/api/feedback/{feedback}/', 6),
+        ('feedback acknowledge', 'employee', 'patch', '/api/feedback/{feedback}/acknowledge/', 7),
+    ]
+
+    def setUp(self):
+        cache.clear()
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.peer_manager = CustomUser.objects.create_user(username='mgr2', password='pw', role='manager')
+        self.employees = [
+            CustomUser.objects.create_user(
+                username=f'emp{i}', password='pw', role='employee', manager=self.manager
+            )
+            for i in range(5)
+        ]
+        self.employee = self.employees[0]
+        self.client = APIClient()
+
+    def _grow(self, rows):
+        """Add `rows` feedback (each with two comments), requests and peer feedback to the manager's scope."""
+        feedback = Feedback.objects.bulk_create([
+            Feedback(
+                manager=self.manager, employee=self.employees[i % len(self.employees)],
+                strengths='Strong reviewer.', areas_to_improve='Delegate more.',
+                sentiment=['Positive', 'Neutral', 'Needs Improvement'][i % 3],
+            )
+            for i in range(rows)
+        ])
+        Comment.objects.bulk_create([
+            Comment(feedback=item, author=author, content='Thanks for the notes.')
+            for item in feedback for author in (self.manager, item.employee)
+        ])
+        FeedbackRequest.objects.bulk_create([
+            FeedbackRequest(
+                requester=self.employees[i % len(self.employees)], target_manager=self.manager, reason='Q3 review'
+            )
+            for i in range(rows)
+        ])
+        PeerFeedback.objects.bulk_create([
+            PeerFeedback(
+                giver=self.employees[i % len(self.employees)], receiver=self.employees[(i + 1) % len(self.employees)],
+                feedback_text='Great pairing session.', is_anonymous=i % 2 == 0,
+            )
+            for i in range(rows)
+        ])
+
+    def _measure(self):
+        feedback = Feedback.objects.filter(manager=self.manager, employee=self.employee, is_acknowledged=False).first()
+        results = {}
+        for name, actor, method, path, _ in self.ENDPOINTS:
+            self.client.force_authenticate(getattr(self, actor))
+            url = path.format(feedback=feedback.id)
+            data = {'is_acknowledged': True} if 'acknowledge' in name else {'sentiment': 'Positive'}
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                if method == 'get':
+                    response = self.client.get(url)
+                else:
+                    response = self.client.patch(url, data, format='json')
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            self.assertLess(response.status_code, 400, f"{name}: HTTP {response.status_code}")
+            results[name] = (len(ctx.captured_queries), elapsed_ms)
+        return results
+
+    def test_query_counts_do_not_grow_with_dataset(self):
+        self._grow(self.SMALL)
+        small = self._measure()
+        self._grow(self.LARGE - self.SMALL)
+        large = self._measure()
+
+        for name, _, _, _, budget in self.ENDPOINTS:
+            with self.subTest(endpoint=name):
+                self.assertEqual(large[name][0], small[name][0], f"{name} query count grows with row count")
+                self.assertLessEqual(large[name][0], budget, f"{name} is over its query budget")
+                self.assertLess(large[name][1], self.LATENCY_CEILING_MS, f"{name} exceeded the latency ceiling")
+
+
+class CommentRenderingTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def test_markdown_is_rendered_and_sanitized_on_write(self):
+        response = self.client.post('/api/comments/', {
+            'feedback': self.feedback.id, 'is_markdown': True,
+            'content': '**Agreed**<script>alert(1)</script>',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('<strong>Agreed</strong>', response.data['content_html'])
+        self.assertNotIn('<script>', response.data['content_html'])
+
+    def test_partial_edit_rerenders_cached_html(self):
+        comment = Comment.objects.create(feedback=self.feedback, author=self.employee, content='*old*', is_markdown=True)
+        response = self.client.patch(f'/api/comments/{comment.id}/', {'content': '*new*'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        comment.refresh_from_db()
+        self.assertEqual(comment.content_html, '<p><em>new</em></p>')
+
+    def test_seeded_comments_have_rendered_html(self):
+        call_command('seed_org', users=12, span=3, depth=1, feedback_per_employee=2, comments_per_feedback=3,
+                     peer_feedback_per_user=0, requests_per_employee=0, prefix='render', stdout=io.StringIO())
+        seeded = Comment.objects.filter(author__username__startswith='render')
+        self.assertTrue(seeded.filter(is_markdown=True).exists())
+        self.assertFalse(seeded.filter(content_html='').exists())
+        self.assertIn('<strong>Follow-up:</strong>', seeded.filter(is_markdown=True).first().content_html)
+
+
+class DenormalizedCounterTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.client = APIClient()
+
+    def _counts(self):
+        self.employee.refresh_from_db()
+        return (self.employee.feedback_received_count, self.employee.pending_ack_count,
+                self.employee.open_request_count)
+
+    def test_counters_follow_create_acknowledge_and_delete(self):
+        feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        request = FeedbackRequest.objects.create(requester=self.employee, target_manager=self.manager, reason='r')
+        comment = Comment.objects.create(feedback=feedback, author=self.employee, content='c')
+        self.assertEqual(self._counts(), (2, 2, 1))
+
+        self.client.force_authenticate(self.employee)
+        self.client.patch(f'/api/feedback/{feedback.id}/acknowledge/', {'is_acknowledged': True}, format='json')
+        request.is_fulfilled = True
+        request.save(update_fields=['is_fulfilled', 'updated_at'])
+        self.assertEqual(self._counts(), (2, 1, 0))
+
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.comment_count, 1)
+        comment.delete()
+        feedback.refresh_from_db()
+        self.assertEqual(feedback.comment_count, 0)
+
+        feedback.delete()
+        self.assertEqual(self._counts(), (1, 1, 0))
+
+    def test_racing_acknowledge_counts_once(self):
+        feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a'
+        )
+        stale = Feedback.objects.get(pk=feedback.pk) # Loaded by the losing request before the winner commits
+        self.client.force_authenticate(self.employee)
+        url = f'/api/feedback/{feedback.id}/acknowledge/'
+        self.assertEqual(self.client.patch(url, {'is_acknowledged': True}, format='json').status_code, 200)
+        with mock.patch('feedback_app.views.FeedbackViewSet.get_object', return_value=stale):
+            response = self.client.patch(url, {'is_acknowledged': True}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._counts(), (1, 0, 0))
+
+    def test_comment_cannot_move_and_moves_keep_counts(self):
+        first = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        second = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        comment = Comment.objects.create(feedback=first, author=self.employee, content='c')
+        self.client.force_authenticate(self.employee)
+        response = self.client.patch(f'/api/comments/{comment.id}/', {'feedback': second.id}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        comment.feedback = second # As the admin would
+        comment.save()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.comment_count, second.comment_count), (0, 1))
+
+    def test_reconcile_repairs_drift(self):
+        Feedback.objects.bulk_create([
+            Feedback(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        ])
+        self.assertEqual(self._counts(), (0, 0, 0)) # bulk_create bypasses signals
+        call_command('reconcile_counters', stdout=io.StringIO())
+        self.assertEqual(self._counts(), (1, 1, 0))
+
+
+class EmployeeStatsTests(TestCase):
+    def test_list_employees_reports_per_report_stats_in_one_query(self):
+        manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        busy = CustomUser.objects.create_user(username='busy', password='pw', role='employee', manager=manager)
+        CustomUser.objects.create_user(username='quiet', password='pw', role='employee', manager=manager)
+        for sentiment in ('Positive', 'Positive', 'Neutral'):
+            latest = Feedback.objects.create(
+                manager=manager, employee=busy, strengths='s', areas_to_improve='a', sentiment=sentiment
+            )
+        FeedbackRequest.objects.create(requester=busy, target_manager=manager, reason='r')
+
+        client = APIClient()
+        client.force_authenticate(manager)
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get('/api/users/employees/', {'ordering': '-feedback_received_count'})
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        busy_row, quiet_row = response.data
+        self.assertEqual(busy_row['username'], 'busy')
+        self.assertEqual(busy_row['sentiment_counts'], {'Positive': 2, 'Neutral': 1, 'Needs Improvement': 0})
+        self.assertEqual(busy_row['pending_ack_count'], 3)
+        self.assertEqual(busy_row['open_request_count'], 1)
+        self.assertEqual(busy_row['last_feedback_at'], latest.created_at.isoformat().replace('+00:00', 'Z'))
+        self.assertIsNone(quiet_row['last_feedback_at'])
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1'], REPLICA_STICKINESS_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    # SimpleTestCase: TestCase's wrapping transaction would keep every read on the primary
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser(id=42, username='emp', role='employee')
+        self.auth = f'Bearer {AccessToken.for_user(self.user)}'
+        self.factory = RequestFactory()
+
+    def _route(self, method):
+        seen = {}
+
+        def view(request):
+            seen['db'] = router.db_for_read(Feedback)
+            return HttpResponse()
+
+        request = getattr(self.factory, method)('/api/feedback/', HTTP_AUTHORIZATION=self.auth)
+        ReplicaRoutingMiddleware(view)(request)
+        return seen['db']
+
+    def test_safe_requests_read_from_replica_until_user_writes(self):
+        self.assertEqual(self._route('get'), 'replica_1')
+        self.assertEqual(self._route('post'), 'default')
+        self.assertEqual(self._route('get'), 'default') # Pinned: read-your-writes
+        cache.clear() # Stickiness window elapsed
+        self.assertEqual(self._route('get'), 'replica_1')
+
+    def test_reads_outside_requests_use_primary(self):
+        self.assertEqual(router.db_for_read(Feedback), 'default')
+
+
+class PartitioningTests(SimpleTestCase):
+    def test_quarterly_bounds_cover_range_across_year_end(self):
+        utc = datetime.timezone.utc
+        bounds = partition_bounds('quarter', datetime.datetime(2024, 11, 5, tzinfo=utc), datetime.datetime(2025, 4, 1, tzinfo=utc))
+        self.assertEqual([suffix for suffix, _, _ in bounds], ['y2024q4', 'y2025q1', 'y2025q2'])
+        self.assertEqual(bounds[0][1:], (datetime.datetime(2024, 10, 1, tzinfo=utc), datetime.datetime(2025, 1, 1, tzinfo=utc)))
+        for (_, _, upper), (_, lower, _) in zip(bounds, bounds[1:]):
+            self.assertEqual(upper, lower) # Contiguous, no gaps for rows to fall into
+
+    def test_commands_refuse_non_postgres(self):
+        if connection.vendor == 'postgresql':
+            self.skipTest("Runs against the local non-Postgres test database")
+        with self.assertRaises(CommandError):
+            call_command('partition_history', stdout=io.StringIO())
+
+
+@skipUnless(connection.vendor == 'postgresql', "Partitioning needs PostgreSQL")
+class PostgresPartitioningTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.old = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        self.new = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        Feedback.objects.filter(pk=self.old.pk).update(created_at=datetime.datetime(2023, 5, 1, tzinfo=datetime.timezone.utc))
+        Comment.objects.create(feedback=self.new, author=self.employee, content='c')
+
+    def _count(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{table}"')
+            return cursor.fetchone()[0]
+
+    def test_convert_routes_rows_and_archives(self):
+        year = timezone.now().year
+        call_command('partition_history', interval='year', ahead=1, stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            for table in PARTITIONED_TABLES:
+                self.assertTrue(is_partitioned(cursor, table))
+            names = {name for name, _, _ in list_partitions(cursor, 'feedback_app_feedback')}
+        self.assertTrue({'feedback_app_feedback_y2023', f'feedback_app_feedback_y{year}'} <= names)
+        self.assertEqual(Feedback.objects.count(), 2)
+        self.assertEqual(Comment.objects.count(), 1)
+        self.assertEqual(self._count('feedback_app_feedback_y2023'), 1)
+        self.assertEqual(self._count(f'feedback_app_feedback_y{year}'), 1)
+        self.assertEqual(self._count('feedback_app_feedback_default'), 0)
+
+        added = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        self.assertGreater(added.pk, self.new.pk) # The new id sequence continues after the copied rows
+        self.assertEqual(self._count(f'feedback_app_feedback_y{year}'), 2)
+
+        call_command('archive_history', before=f'{year}-01-01', stdout=io.StringIO())
+        with connection.cursor() as cursor:
+            names = {name for name, _, _ in list_partitions(cursor, 'feedback_app_feedback')}
+        self.assertNotIn('feedback_app_feedback_y2023', names)
+        self.assertEqual(self._count('feedback_app_feedback_archive'), 1)
+        self.assertEqual(Feedback.objects.count(), 3)
+        self.assertEqual(Feedback.objects.get(pk=self.old.pk).strengths, 's') # Still queryable through the parent
+
+
+class SentimentClassificationTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+
+    def _feedback(self, strengths, areas, **extra):
+        return Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths=strengths, areas_to_improve=areas, **extra
+        )
+
+    def test_backfill_labels_unlabelled_rows_and_keeps_manager_labels(self):
+        praised = self._feedback('Excellent, reliable and consistently thorough.', 'Could share context earlier.')
+        flagged = self._feedback('Friendly.', 'Often misses deadlines; reviews are late and not clear.')
+        manual = self._feedback('Excellent work.', 'None.', sentiment='Neutral', sentiment_source='manager')
+
+        call_command('classify_sentiment', batch_size=1, stdout=io.StringIO())
+
+        labels = dict(Feedback.objects.values_list('pk', 'sentiment'))
+        self.assertEqual(labels[praised.pk], 'Positive')
+        self.assertEqual(labels[flagged.pk], 'Needs Improvement')
+        self.assertEqual(labels[manual.pk], 'Neutral')
+
+    def test_editing_text_clears_classifier_label(self):
+        feedback = self._feedback('Excellent work.', 'None.', sentiment='Positive', sentiment_source='classifier')
+        client = APIClient()
+        client.force_authenticate(self.manager)
+
+        response = client.patch(f'/api/feedback/{feedback.pk}/', {'strengths': 'Missed every deadline.'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['sentiment'])
+
+        response = client.patch(f'/api/feedback/{feedback.pk}/', {'sentiment': 'Great!'}, format='json')
+        self.assertEqual(response.status_code, 400) # Only the three buckets are accepted
+
+    def test_batch_scores_each_distinct_text_once(self):
+        rows = [(1, 'Excellent work.', 'None.'), (2, 'Excellent work.', 'Missed deadlines.'), (3, 'Late.', 'None.')]
+        with mock.patch('feedback_app.sentiment.score_text', wraps=sentiment.score_text) as score_text:
+            labels = sentiment.classify_batch(rows)
+        self.assertEqual(score_text.call_count, 4)
+        self.assertEqual(labels, {pk: sentiment.classify(strengths, areas) for pk, strengths, areas in rows})
+
+    def test_database_rejects_sentiment_outside_choices(self):
+        feedback = self._feedback('Excellent work.', 'None.')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Feedback.objects.filter(pk=feedback.pk).update(sentiment='Great!') # Bypasses the serializer
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+    def _create(self, **data):
+        return self.client.post('/api/feedback/', {
+            'employee': self.employee.id, 'strengths': 'Excellent and reliable.', 'areas_to_improve': 'None.', **data,
+        }, format='json')
+
+    def test_write_and_event_commit_together_and_worker_runs_handlers(self):
+        response = self._create()
+        self.assertEqual(response.status_code, 201)
+        event = OutboxEvent.objects.get(topic='feedback.created')
+        self.assertEqual(event.payload['id'], response.data['id'])
+        self.assertIsNone(response.data['sentiment'])
+
+        call_command('drain_outbox', concurrency=1, stdout=io.StringIO())
+
+        event.refresh_from_db()
+        self.assertEqual(event.status, 'done')
+        self.assertEqual(Feedback.objects.get(pk=response.data['id']).sentiment, 'Positive')
+
+    def test_error_response_rolls_back_write_and_event(self):
+        # Fails after the row and its outbox event were written; DRF answers 400 rather than raising
+        with mock.patch('feedback_app.views.FeedbackSerializer.to_representation', side_effect=ValidationError('late')):
+            response = self._create()
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Feedback.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failing_handler_is_retried_with_backoff_then_given_up(self):
+        calls = []
+
+        @outbox.handles('test.flaky')
+        def flaky(payload):
+            calls.append(payload)
+            raise RuntimeError('downstream unavailable')
+
+        self.addCleanup(outbox._handlers.pop, 'test.flaky')
+        event = outbox.enqueue('test.flaky', id=1)
+        with override_settings(OUTBOX_MAX_ATTEMPTS=2), self.assertLogs('feedback_app.outbox', 'ERROR'):
+            self.assertEqual(outbox.drain(), (0, 1))
+            event.refresh_from_db()
+            self.assertEqual((event.status, event.attempts), ('pending', 1))
+            self.assertIn('downstream unavailable', event.last_error)
+            self.assertEqual(outbox.drain(), (0, 0)) # Backing off
+
+            OutboxEvent.objects.filter(pk=event.pk).update(available_at=event.created_at) # Backoff elapsed
+            self.assertEqual(outbox.drain(), (0, 1))
+        event.refresh_from_db()
+        self.assertEqual((event.status, len(calls)), ('failed', 2))
+
+
+class ReviewCycleDossierTests(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(username='admin', password='pw')
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.employee = CustomUser.objects.create_user(
+            username='emp', password='pw', role='employee', manager=self.manager
+        )
+        self.peer = CustomUser.objects.create_user(username='peer', password='pw', role='employee', manager=self.manager)
+        self.outsider = CustomUser.objects.create_user(username='out', password='pw', role='employee')
+        self.client = APIClient()
+
+        feedback = Feedback.objects.create(
+            manager=self.manager, employee=self.employee, strengths='Reliable.', areas_to_improve='None.',
+            sentiment='Positive',
+        )
+        Comment.objects.create(feedback=feedback, author=self.employee, content='Thanks!')
+        late = Comment.objects.create(feedback=feedback, author=self.manager, content='Posted after the cycle closed.')
+        Comment.objects.filter(pk=late.pk).update(created_at=timezone.now() + datetime.timedelta(days=2))
+        PeerFeedback.objects.create(giver=self.peer, receiver=self.employee, feedback_text='Great pairing.', is_anonymous=True)
+        old = Feedback.objects.create(manager=self.manager, employee=self.employee, strengths='s', areas_to_improve='a')
+        Feedback.objects.filter(pk=old.pk).update(created_at=timezone.now() - datetime.timedelta(days=400))
+
+    def _create_cycle(self):
+        self.client.force_authenticate(self.admin)
+        now = timezone.now()
+        return self.client.post('/api/review-cycles/', {
+            'name': 'H2', 'starts_at': (now - datetime.timedelta(days=180)).isoformat(),
+            'ends_at': (now + datetime.timedelta(days=1)).isoformat(),
+        }, format='json')
+
+    def test_cycle_builds_dossiers_in_background_and_serves_them_frozen(self):
+        response = self._create_cycle()
+        self.assertEqual((response.status_code, response.data['status']), (201, 'building'))
+        self.assertFalse(Dossier.objects.exists()) # Not built on the request
+
+        call_command('drain_outbox', concurrency=1, stdout=io.StringIO())
+        self.assertEqual(ReviewCycle.objects.get().status, 'ready')
+
+        self.client.force_authenticate(self.manager)
+        with CaptureQueriesContext(connection) as ctx:
+            listing = self.client.get(f"/api/dossiers/?cycle={response.data['id']}")
+        self.assertLessEqual(len(ctx.captured_queries), 2) # Served from stored payloads
+        by_employee = {d['employee']: d['data'] for d in listing.data}
+        self.assertEqual(set(by_employee), {self.employee.id, self.peer.id})
+
+        data = by_employee[self.employee.id]
+        self.assertEqual(len(data['feedback']), 1) # The 400-day-old feedback is outside the cycle
+        self.assertEqual([c['author'] for c in data['feedback'][0]['comments']], ['emp']) # Not the post-cycle reply
+        self.assertEqual(data['sentiment_counts']['Positive'], 1)
+        self.assertEqual(data['peer_feedback'][0]['giver'], 'Anonymous')
+        self.assertNotIn('peer', str(data['peer_feedback']))
+
+        # Later edits don't leak into the frozen dossier
+        Feedback.objects.filter(employee=self.employee).update(strengths='Edited.')
+        detail = self.client.get(f"/api/dossiers/{Dossier.objects.get(employee=self.employee).pk}/")
+        self.assertEqual(detail.data['data']['feedback'][0]['strengths'], 'Reliable.')
+
+    def test_only_admins_create_cycles_and_others_see_no_foreign_dossiers(self):
+        self.client.force_authenticate(self.manager)
+        self.assertEqual(self.client.post('/api/review-cycles/', {}, format='json').status_code, 403)
+
+        self._create_cycle()
+        call_command('drain_outbox', concurrency=1, stdout=io.StringIO())
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get('/api/dossiers/').data, [])
+        dossier = Dossier.objects.get(employee=self.employee)
+        self.assertEqual(self.client.get(f'/api/dossiers/{dossier.pk}/pdf/').status_code, 404)
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get(f'/api/dossiers/{dossier.pk}/pdf/')['Content-Type'], 'application/pdf')
+
+        self.assertEqual(self.client.get('/api/dossiers/?cycle=abc').status_code, 400)
+
+        ReviewCycle.objects.update(status='building') # Rebuilding: half the dossiers may be from the new run
+        self.assertEqual(self.client.get('/api/dossiers/').data, [])
+        self.assertEqual(self.client.get(f'/api/dossiers/{dossier.pk}/').status_code, 404)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class OrgImportTests(TestCase):
+    def _rows(self, text):
+        return read_rows(io.StringIO(text))
+
+    def test_imports_hierarchy_in_dependency_order(self):
+        existing = CustomUser.objects.create_user(username='ceo', password='pw', role='manager')
+        # Reports listed before their managers; the importer orders the inserts itself
+        result = import_users(self._rows(
+            "username,email,role,manager,password\n"
+            "ic1,ic1@example.com,employee,lead,s3cret\n"
+            "ic2,,,lead,\n"
+            "lead,,manager,vp,\n"
+            "vp,,manager,ceo,\n"
+        ), workers=1)
+        self.assertEqual((result.created, result.errors), (4, []))
+        managers = dict(CustomUser.objects.values_list('username', 'manager__username'))
+        self.assertEqual(managers, {'ceo': None, 'vp': 'ceo', 'lead': 'vp', 'ic1': 'lead', 'ic2': 'lead'})
+        self.assertTrue(CustomUser.objects.get(username='ic1').check_password('s3cret'))
+        self.assertFalse(CustomUser.objects.get(username='ic2').has_usable_password())
+        self.assertEqual(CustomUser.objects.get(username='ic2').role, 'employee')
+        self.assertEqual(existing.employees.get().username, 'vp')
+
+    def test_rejects_whole_file_on_cycles_and_bad_references(self):
+        CustomUser.objects.create_user(username='emp', password='pw', role='employee')
+        result = import_users(self._rows(
+            "username,role,manager\n"
+            "a,manager,b\n"
+            "b,manager,a\n"
+            "c,employee,emp\n"
+            "d,employee,ghost\n"
+            "d,employee,\n"
+            "e,intern,\n"
+        ), workers=1)
+        self.assertEqual(result.created, 0)
+        self.assertEqual(CustomUser.objects.count(), 1)
+        problems = '\n'.join(result.errors)
+        for expected in ('reporting cycle a -> b -> a', "'emp' is not a manager", "'ghost' not found",
+                         "duplicate username 'd'", "unknown role 'intern'"):
+            self.assertIn(expected, problems)
+
+    def test_rejects_values_the_model_fields_would_reject(self):
+        result = import_users(self._rows(
+            "username,email,first_name\n"
+            "has space,a@example.com,\n"
+            "ok,not-an-email,\n"
+            f"{'u' * 151},,\n"
+            f"named,,{'n' * 151}\n"
+            "fine,fine@example.com,Fine\n"
+        ), workers=1)
+        self.assertEqual(result.created, 0)
+        self.assertEqual(len(result.errors), 4)
+        for line, field in ((2, 'username'), (3, 'email'), (4, 'username'), (5, 'first_name')):
+            self.assertTrue(any(error.startswith(f"line {line}: {field}: ") for error in result.errors), result.errors)
+
+    def test_endpoint_reports_non_utf8_files(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_superuser(username='admin', password='pw'))
+        latin1 = "username,first_name\njose,José\n".encode('latin-1') # As Excel's plain "CSV" export writes it
+        response = client.post('/api/users/import/', {'file': SimpleUploadedFile('org.csv', latin1, 'text/csv')})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.data['errors'][0])
+
+    @override_settings(ORG_IMPORT_SYNC_MAX_ROWS=2)
+    def test_endpoint_refuses_large_files(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_superuser(username='admin', password='pw'))
+        upload = SimpleUploadedFile('org.csv', b"username\na\nb\nc\n", 'text/csv')
+        response = client.post('/api/users/import/', {'file': upload})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('import_org', response.data['detail'])
+        self.assertFalse(CustomUser.objects.filter(username='a').exists())
+
+    def test_endpoint_is_superuser_only(self):
+        admin = CustomUser.objects.create_superuser(username='admin', password='pw')
+        manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        client = APIClient()
+        upload = lambda: SimpleUploadedFile('org.csv', b"username,role,manager\nnew,employee,mgr\n", 'text/csv')
+
+        client.force_authenticate(manager)
+        self.assertEqual(client.post('/api/users/import/', {'file': upload()}).status_code, 403)
+        client.force_authenticate(admin)
+        response = client.post('/api/users/import/', {'file': upload()})
+        self.assertEqual((response.status_code, response.data['created']), (201, 1))
+        self.assertEqual(CustomUser.objects.get(username='new').manager, manager)
+
+    def test_hashes_in_process_pool(self):
+        hashes = hash_passwords(['one', 'two', None], workers=2)
+        self.assertTrue(hashes[0].startswith('md5$'))
+        self.assertTrue(hashes[2].startswith('!')) # Unusable
+
+    def test_endpoint_never_forks_the_serving_process(self):
+        client = APIClient()
+        client.force_authenticate(CustomUser.objects.create_superuser(username='admin', password='pw'))
+        upload = SimpleUploadedFile('org.csv', b"username,password\na,pw-a\nb,pw-b\nc,pw-c\n", 'text/csv')
+        with mock.patch('feedback_app.org_import.ProcessPoolExecutor', side_effect=AssertionError('forked')):
+            response = client.post('/api/users/import/', {'file': upload})
+        self.assertEqual((response.status_code, response.data['created']), (201, 3))
+        self.assertTrue(CustomUser.objects.get(username='b').check_password('pw-b'))
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage') # No collectstatic manifest here
+class AdminChangelistTests(TestCase):
+    CHANGELISTS = ['customuser', 'feedback', 'comment', 'feedbackrequest', 'peerfeedback', 'outboxevent', 'dossier']
+
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(username='admin', password='pw')
+        self.manager = CustomUser.objects.create_user(username='mgr', password='pw', role='manager')
+        self.client.force_login(self.admin)
+
+    def _add_rows(self, n):
+        for i in range(n):
+            employee = CustomUser.objects.create_user(
+                username=f'emp{CustomUser.objects.count()}', password='pw', role='employee', manager=self.manager
+            )
+            feedback = Feedback.objects.create(manager=self.manager, employee=employee, strengths='s', areas_to_improve='a')
+            Comment.objects.create(feedback=feedback, author=employee, content='c')
+            FeedbackRequest.objects.create(requester=employee, target_manager=self.manager, reason='r')
+            PeerFeedback.objects.create(giver=employee, receiver=self.manager, feedback_text='p')
+        cycle = ReviewCycle.objects.create(name='c', starts_at=timezone.now(), ends_at=timezone.now())
+        Dossier.objects.bulk_create([
+            Dossier(cycle=cycle, employee=user, built_at=timezone.now()) for user in CustomUser.objects.all()
+        ])
+
+    def _queries(self):
+        counts = {}
+        for name in self.CHANGELISTS:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f'/admin/feedback_app/{name}/')
+            self.assertEqual(response.status_code, 200, name)
+            counts[name] = len(ctx.captured_queries)
+        return counts
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self._add_rows(2)
+        small = self._queries()
+        self._add_rows(20)
+        self.assertEqual(self._queries(), small)
+
+
+class LoginThroughputTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=1000):
+            self.user = CustomUser.objects.create_user(username='emp', password='pw', role='employee')
+
+    def _login(self):
+        response = self.client.post('/api/token/', {'username': 'emp', 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_login_rehashes_to_current_cost(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self._login()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+
+    @mock.patch('feedback_app.serializers.revocations_are_shared', return_value=True)
+    def test_refresh_does_not_query_and_keeps_claims(self, shared):
+        refresh = self._login()['refresh']
+        with self.assertNumQueries(0):
+            response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.data['access'])
+        self.assertEqual((access['username'], access['role']), ('emp', 'employee'))
+
+    @mock.patch('feedback_app.serializers.revocations_are_shared', return_value=True)
+    def test_deactivated_user_cannot_refresh(self, shared):
+        refresh = self._login()['refresh']
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_per_process_cache_falls_back_to_user_lookup(self):
+        refresh = self._login()['refresh']
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        cache.clear() # Revocation made on another worker, or lost in a restart
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
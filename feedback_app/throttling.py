@@ -0,0 +1,98 @@
+# D:\GrowthFlow\feedback_app\throttling.py
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+LOCK_ATTEMPTS = 20 # About 20ms of waiting on a contended bucket before letting the request through
+
+# Refill by the time elapsed since the last request, then spend. Redis runs the whole script atomically
+# and its own clock keeps every worker on the same time base.
+SPEND_SCRIPT = """
+local capacity, rate, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'refilled_at')
+local tokens = tonumber(state[1]) or capacity
+local refilled_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - refilled_at) * rate)
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'refilled_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class CostClassThrottle(BaseThrottle):
+    """
+    Token buckets keyed by user id (or client IP when anonymous) and the
+    endpoint's cost class. A bucket holds up to `capacity` tokens and refills
+    continuously at capacity/period tokens per second; each request spends the
+    class's `cost`. Bursts are therefore capped at `capacity`, with no window
+    boundary to spend a second full budget across.
+
+    Each bucket is stored in the cache as (tokens, last refill time). On Redis
+    the refill-and-spend is one Lua script; on other backends it runs under a
+    short cache.add() lock. Either way every worker sharing the cache shares one
+    budget. Views opt actions into a heavier class with `throttle_cost_classes`.
+    """
+    cache = cache
+    default_class = 'default'
+    timer = time.time
+
+    def get_cost_class(self, view):
+        return getattr(view, 'throttle_cost_classes', {}).get(getattr(view, 'action', None), self.default_class)
+
+    def allow_request(self, request, view):
+        cost_class = self.get_cost_class(view)
+        bucket = settings.THROTTLE_BUCKETS[cost_class]
+        if request.user and request.user.is_authenticated:
+            ident = f'user-{request.user.pk}'
+        else:
+            ident = f'ip-{self.get_ident(request)}'
+
+        key = f'throttle:{cost_class}:{ident}'
+        rate = bucket['capacity'] / bucket['period'] # Tokens per second
+        allowed, tokens = self.spend(key, bucket['capacity'], rate, bucket['cost'])
+        if not allowed:
+            self.wait_seconds = (bucket['cost'] - tokens) / rate
+        return allowed
+
+    def spend(self, key, capacity, rate, cost):
+        """Refill the bucket for the time elapsed, then take `cost` tokens if it holds enough. Returns (allowed, tokens left)."""
+        if isinstance(self.cache, RedisCache):
+            key = self.cache.make_and_validate_key(key)
+            client = self.cache._cache.get_client(key, write=True)
+            allowed, tokens = client.eval(SPEND_SCRIPT, 1, key, capacity, rate, cost)
+            return bool(allowed), float(tokens)
+
+        lock = f'{key}:lock'
+        for _ in range(LOCK_ATTEMPTS):
+            if self.cache.add(lock, 1, timeout=1):
+                break
+            time.sleep(0.001)
+        else:
+            return True, 0.0 # Never fail a request because the throttle itself is contended
+        try:
+            now = self.timer()
+            tokens, refilled_at = self.cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - refilled_at) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # An expired bucket would have refilled completely anyway
+            self.cache.set(key, (tokens, now), timeout=math.ceil(capacity / rate) + 1)
+            return allowed, tokens
+        finally:
+            self.cache.delete(lock)
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,44 @@
+# D:\GrowthFlow\feedback_app\tokens.py
+
+"""
+Refresh-token revocation without a database lookup.
+
+StatelessTokenRefreshSerializer trusts the refresh token's signature and only
+asks the cache whether the user's tokens were revoked after it was issued.
+Deactivating a user (see signals.py) records that moment for as long as a
+refresh token can live. That is only safe when every worker reads the same
+cache and it survives restarts, so without one (no REDIS_URL gives a
+per-process LocMemCache) refreshes fall back to simplejwt's user lookup.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings
+
+# Backends that every worker shares and that outlive a restart
+SHARED_CACHE_BACKENDS = {
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.db.DatabaseCache',
+    'django_redis.cache.RedisCache',
+}
+
+
+def _key(user_id):
+    return f'tokens-revoked:{user_id}'
+
+
+def revocations_are_shared():
+    return settings.CACHES['default']['BACKEND'] in SHARED_CACHE_BACKENDS
+
+
+def revoke_tokens(user_id):
+    """Reject every refresh token issued to this user until now."""
+    timeout = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    cache.set(_key(user_id), int(time.time()), timeout=timeout)
+
+
+def is_revoked(user_id, issued_at):
+    revoked_at = cache.get(_key(user_id))
+    return revoked_at is not None and issued_at <= revoked_at
@@ -1,7 +1,11 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import UserViewSet, FeedbackViewSet, CommentViewSet, FeedbackRequestViewSet, PeerFeedbackViewSet
+from .views import (
+    UserViewSet, FeedbackViewSet, CommentViewSet, FeedbackRequestViewSet, PeerFeedbackViewSet,
+    ReviewCycleViewSet, DossierViewSet,
+)
+from .notifications import notification_stream
 
 router = DefaultRouter()
 router.register(r'users', UserViewSet, basename='user')
@@ -9,7 +13,10 @@ router.register(r'feedback', FeedbackViewSet, basename='feedback')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'feedback-requests', FeedbackRequestViewSet, basename='feedbackrequest')
 router.register(r'peer-feedback', PeerFeedbackViewSet, basename='peerfeedback')
+router.register(r'review-cycles', ReviewCycleViewSet, basename='reviewcycle')
+router.register(r'dossiers', DossierViewSet, basename='dossier')
 
 urlpatterns = [
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -3,19 +3,32 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models.signals import post_save
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Count, Case, When, BooleanField, IntegerField
-from django.db.models.functions import TruncMonth # For monthly trends
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.db.models import Q, Count, Max, Case, When, BooleanField, IntegerField, Prefetch, F, OuterRef, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber, TruncMonth # For monthly trends
 from django.http import HttpResponse # For PDF export
 
 import datetime
+import hashlib
 from django.utils import timezone
 
 
-from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback
+from .models import CustomUser, Feedback, Comment, FeedbackRequest, PeerFeedback, Tombstone, ReviewCycle, Dossier
+from .org_import import ImportFileError, import_users, read_rows
+from .outbox import enqueue
+from .pagination import CommentThreadPagination
+from .rendering import html_to_text
+from .signals import tombstone_horizon
 from .serializers import (
-    UserSerializer, FeedbackSerializer, MyTokenObtainPairSerializer, # Make sure MyTokenObtainPairSerializer is here
-    CommentSerializer, FeedbackRequestSerializer, PeerFeedbackSerializer
+    UserSerializer, EmployeeStatsSerializer, FeedbackSerializer, MyTokenObtainPairSerializer, # Make sure MyTokenObtainPairSerializer is here
+    CommentSerializer, FeedbackRequestSerializer, PeerFeedbackSerializer, ReviewCycleSerializer, DossierSerializer
 )
 
 from rest_framework_simplejwt.views import TokenObtainPairView
@@ -36,6 +49,177 @@ class MyTokenObtainPairView(TokenObtainPairView):
 
 
 
+def claim_flag(instance, field):
+    """
+    Set a boolean flag with one conditional UPDATE that only matches while it is
+    still False, then fire post_save as save(update_fields=...) would, so the
+    counter, outbox and notification signals run for the winner only. Returns
+    False when a concurrent request already set it.
+    """
+    now = timezone.now()
+    model = type(instance)
+    if not model.objects.filter(pk=instance.pk, **{field: False}).update(**{field: True, 'updated_at': now}):
+        return False
+    setattr(instance, field, True)
+    instance.updated_at = now
+    post_save.send(
+        sender=model, instance=instance, created=False, raw=False,
+        using=router.db_for_write(model, instance=instance), update_fields=frozenset([field, 'updated_at']),
+    )
+    return True
+
+
+class AtomicWritesMixin:
+    """
+    Run unsafe requests in one transaction, so the outbox events their signals
+    enqueue commit (or roll back) together with the change itself. DRF turns
+    exceptions into error responses before they reach the atomic block, so an
+    exception response marks the transaction for rollback explicitly.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in permissions.SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with transaction.atomic():
+            response = super().dispatch(request, *args, **kwargs)
+            if getattr(response, 'exception', False):
+                transaction.set_rollback(True)
+            return response
+
+
+class ChangedFieldsUpdateMixin:
+    """
+    Persists only the columns whose values actually changed on update.
+    A PATCH that touches `sentiment` should not rewrite large TextFields
+    like `strengths` or `feedback_text`. `updated_at` is bumped alongside
+    the changed columns when the model has one.
+    """
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        changed_fields = []
+        for name, value in serializer.validated_data.items():
+            field = instance._meta.get_field(name)
+            if not field.concrete or field.many_to_many:
+                # Fall back to the serializer's full save for m2m/reverse relations
+                serializer.save()
+                return
+            if field.is_relation:
+                current = getattr(instance, field.attname)
+                new = value.pk if value is not None else None
+            else:
+                current = getattr(instance, name)
+                new = value
+            if current != new:
+                setattr(instance, name, value)
+                changed_fields.append(name)
+
+        if not changed_fields:
+            return # Nothing to write
+
+        if any(f.name == 'updated_at' for f in instance._meta.concrete_fields):
+            changed_fields.append('updated_at')
+        instance.save(update_fields=changed_fields)
+
+
+class DeltaSyncMixin:
+    """
+    Incremental list sync for clients that cache resources locally.
+    Every list response carries an `X-Sync-Token` header. Passing it back as
+    `?updated_since=<token>` returns only rows whose `updated_at` advanced,
+    plus the ids deleted from (or moved out of) the caller's scope since then,
+    and a fresh `sync_token`. When the caller's own scope changed since the
+    token (new manager, new reports, role change), `reset` is true and
+    `results` holds the full scope, which replaces the client's copy.
+    """
+    tombstone_resource = None # Matches Tombstone.resource for this viewset's model
+
+    def _parse_updated_since(self, request):
+        raw = request.query_params.get('updated_since')
+        if raw is None:
+            return None
+        try:
+            since = parse_datetime(raw)
+        except ValueError: # Well formed but impossible, e.g. month 13 or a +99:00 offset
+            since = None
+        if since is None:
+            raise ValidationError({"updated_since": "Expected an ISO 8601 timestamp."})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since, datetime.timezone.utc)
+        return since
+
+    def list(self, request, *args, **kwargs):
+        since = self._parse_updated_since(request)
+        # updated_at/deleted_at are stamped when a write happens but only become visible when it commits,
+        # so a write still open now may commit with an earlier timestamp. Backdate the token by the longest
+        # a write transaction can stay open: clients see some rows twice (results are upserts), never miss one.
+        overlap = datetime.timedelta(seconds=getattr(settings, 'DELTA_SYNC_OVERLAP_SECONDS', 60))
+        sync_token = (timezone.now() - overlap).isoformat()
+        if since is None:
+            response = super().list(request, *args, **kwargs)
+            response['X-Sync-Token'] = sync_token
+            return response
+
+        user = request.user
+        # Resync in full if the user's scope changed, or the tombstones since the token may have been purged
+        horizon = tombstone_horizon()
+        reset = since < horizon or (user.sync_reset_at is not None and since < user.sync_reset_at)
+        changed = self.filter_queryset(self.get_queryset())
+        deleted = []
+        if not reset:
+            changed = changed.filter(updated_at__gte=since)
+            deleted = Tombstone.objects.filter(
+                resource=self.tombstone_resource, deleted_at__gte=since,
+                visible_to=None if user.is_superuser else user.pk,
+            ).values_list('object_id', flat=True).distinct()
+        serializer = self.get_serializer(changed.order_by('updated_at'), many=True)
+        response = Response({
+            "results": serializer.data,
+            "deleted": list(deleted),
+            "reset": reset,
+            "sync_token": sync_token,
+        })
+        response['X-Sync-Token'] = sync_token
+        return response
+
+
+class ConditionalListMixin:
+    """
+    Weak ETags for list responses, derived from the row count and
+    max(updated_at) of the user's visible scope. A single aggregate query
+    decides whether the client's copy is current, and a 304 is returned
+    before anything is serialized.
+    """
+    def get_etag_querysets(self, queryset):
+        # Override to fold in related rows that appear in the payload
+        return [queryset]
+
+    def list_etag(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        parts = [str(request.user.pk), request.get_full_path()]
+        last_modified = None
+        for qs in self.get_etag_querysets(queryset):
+            # Aggregate by pk so DISTINCT scopes don't drag TextFields into a subquery
+            scope = qs.model.objects.filter(pk__in=qs.values('pk')).order_by()
+            stats = scope.aggregate(count=Count('pk'), last=Max('updated_at'))
+            parts += [str(stats['count']), stats['last'].isoformat() if stats['last'] else '-']
+            if stats['last'] and (last_modified is None or stats['last'] > last_modified):
+                last_modified = stats['last']
+        digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+        return f'W/"{digest}"', last_modified
+
+    def list(self, request, *args, **kwargs):
+        etag, last_modified = self.list_etag(request)
+        client_etags = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+        if '*' in client_etags or etag.removeprefix('W/') in {e.removeprefix('W/') for e in client_etags}:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+
 class IsOwnerOfObject(permissions.BasePermission):
     """
     Custom permission to only allow owners of an object to edit/delete it.
@@ -61,7 +245,7 @@ class IsFeedbackManagerOrTargetEmployee(permissions.BasePermission):
                 return True
             if obj.employee == user:
                 return True
-            if user.role == 'manager' and obj.employee.manager == user:
+            if user.role == 'manager' and obj.employee.manager_id == user.id:
                 return True
             return False
 
@@ -116,12 +300,21 @@ class IsPeerFeedbackGiverOrReceiver(permissions.BasePermission):
             return obj.giver == user or obj.receiver == user or user.is_superuser or user.role == 'manager'
         return obj.giver == user
 
+class IsSuperuserOrReadOnly(permissions.BasePermission):
+    """
+    Org-wide objects (review cycles): anyone signed in can read, only admins can change them.
+    """
+    def has_permission(self, request, view):
+        return request.method in permissions.SAFE_METHODS or request.user.is_superuser
+
 
 # --- User ViewSet ---
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ChangedFieldsUpdateMixin, viewsets.ModelViewSet):
     queryset = CustomUser.objects.all().order_by('username')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    employee_orderings = ('username', 'feedback_received_count', 'pending_ack_count', 'open_request_count',
+                          'last_feedback_at')
 
     def get_queryset(self):
         user = self.request.user
@@ -138,6 +331,36 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(request.user)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=[permissions.IsAuthenticated],
+            parser_classes=[MultiPartParser])
+    def import_csv(self, request):
+        """
+        Bulk-create users from an uploaded CSV (`file`); see org_import.py. `?dry_run=1` only validates.
+        Files over ORG_IMPORT_SYNC_MAX_ROWS are refused; import those with `manage.py import_org`.
+        """
+        if not request.user.is_superuser:
+            return Response({"detail": "Only superusers can import users."}, status=status.HTTP_403_FORBIDDEN)
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Upload the CSV as the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        max_rows = getattr(settings, 'ORG_IMPORT_SYNC_MAX_ROWS', 2000)
+        try:
+            rows = read_rows(upload.file, limit=max_rows)
+        except ImportFileError as e:
+            return Response({"created": 0, "errors": [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > max_rows:
+            return Response(
+                {"detail": f"Files over {max_rows} rows can't be imported in a request; use `manage.py import_org`."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        result = import_users(rows, dry_run=dry_run)
+        if result.errors:
+            return Response({"created": 0, "errors": result.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"created": result.created, "errors": []},
+                        status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
     @action(detail=False, methods=['get'], url_path='employees', permission_classes=[permissions.IsAuthenticated])
     def list_employees(self, request):
         if request.user.is_superuser:
@@ -146,45 +369,90 @@ class UserViewSet(viewsets.ModelViewSet):
             employees = CustomUser.objects.filter(manager=request.user, role='employee').order_by('username')
         else:
             return Response({"detail": "You do not have permission to view this."}, status=status.HTTP_403_FORBIDDEN)
-        
-        serializer = self.get_serializer(employees, many=True)
+
+        # Per-report stats as correlated subqueries, so the whole page is one query.
+        # Pending acknowledgments and open requests are stored counters on the user row.
+        received = Feedback.objects.filter(employee=OuterRef('pk')).order_by()
+
+        def sentiment_count(sentiment):
+            return Coalesce(Subquery(
+                received.filter(sentiment=sentiment).values('employee').annotate(n=Count('pk')).values('n')
+            ), 0)
+
+        employees = employees.annotate(
+            last_feedback_at=Subquery(received.order_by('-created_at').values('created_at')[:1]),
+            positive_count=sentiment_count('Positive'),
+            neutral_count=sentiment_count('Neutral'),
+            needs_improvement_count=sentiment_count('Needs Improvement'),
+        )
+
+        ordering = request.query_params.get('ordering')
+        if ordering and ordering.lstrip('-') in self.employee_orderings:
+            employees = employees.order_by(ordering, 'username')
+
+        serializer = EmployeeStatsSerializer(employees, many=True, context=self.get_serializer_context())
         return Response(serializer.data)
 
 
 # --- Feedback ViewSet ---
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(AtomicWritesMixin, ConditionalListMixin, DeltaSyncMixin, ChangedFieldsUpdateMixin, viewsets.ModelViewSet):
     queryset = Feedback.objects.all().order_by('-created_at')
     serializer_class = FeedbackSerializer
     permission_classes = [permissions.IsAuthenticated, IsFeedbackManagerOrTargetEmployee]
+    tombstone_resource = 'feedback'
+    throttle_cost_classes = {'manager_summary': 'summary', 'export_pdf': 'pdf'}
 
     def perform_create(self, serializer):
         if self.request.user.role != 'manager':
             return Response({"detail": "Only managers can create feedback."}, status=status.HTTP_403_FORBIDDEN)
         serializer.save(manager=self.request.user)
 
+    def get_etag_querysets(self, queryset):
+        # Comments are nested in the payload, so their edits must change the ETag too
+        return [queryset, Comment.objects.filter(feedback__in=queryset)]
+
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser:
-            return Feedback.objects.all().order_by('-created_at')
+            queryset = Feedback.objects.all()
         elif user.role == 'manager':
-            return Feedback.objects.filter(
+            queryset = Feedback.objects.filter(
                 Q(manager=user) | Q(employee__manager=user)
-            ).distinct().order_by('-created_at')
+            ).distinct()
         elif user.role == 'employee':
-            return Feedback.objects.filter(employee=user).order_by('-created_at')
-        return Feedback.objects.none()
+            queryset = Feedback.objects.filter(employee=user)
+        else:
+            return Feedback.objects.none()
+        if self.action in ('thread_comments', 'export_pdf'):
+            # These load the comment thread themselves; skip the list-view previews
+            return queryset.select_related('manager', 'employee').order_by('-created_at')
+
+        # Usernames and the latest comments are serialized for every row; fetch them up front
+        latest_comments = Comment.objects.select_related('author').annotate(
+            thread_position=Window(RowNumber(), partition_by=F('feedback_id'), order_by=[F('created_at').desc(), F('id').desc()])
+        ).filter(thread_position__lte=FeedbackSerializer.LATEST_COMMENTS)
+        return queryset.select_related('manager', 'employee').prefetch_related(
+            Prefetch('comments', queryset=latest_comments, to_attr='latest_comments')
+        ).order_by('-created_at')
 
     @action(detail=True, methods=['patch'])
     def acknowledge(self, request, pk=None):
         feedback = self.get_object()
-        if feedback.is_acknowledged:
+        if not claim_flag(feedback, 'is_acknowledged'): # Two racing acknowledges must not both count
             return Response({"detail": "Feedback already acknowledged."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        feedback.is_acknowledged = True
-        feedback.save()
         serializer = self.get_serializer(feedback)
         return Response(serializer.data)
 
+    # --- Paginated comment thread ---
+    @action(detail=True, methods=['get'], url_path='comments')
+    def thread_comments(self, request, pk=None):
+        feedback = self.get_object()
+        comments = Comment.objects.filter(feedback=feedback).select_related('author')
+        paginator = CommentThreadPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
     # --- Manager Dashboard Summary ---
     @action(detail=False, methods=['get'], url_path='manager-summary',
             permission_classes=[permissions.IsAuthenticated])
@@ -193,10 +461,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         if user.role != 'manager' and not user.is_superuser:
             return Response({"detail": "Access denied. Only managers can view feedback summaries."}, status=status.HTTP_403_FORBIDDEN)
 
-        manager_relevant_feedback = self.get_queryset()
-
         total_feedback_given_by_me = Feedback.objects.filter(manager=user).count()
-        total_feedback_for_my_reports = Feedback.objects.filter(employee__manager=user).count()
 
         sentiment_counts_given_by_me = Feedback.objects.filter(manager=user) \
                                                     .values('sentiment') \
@@ -215,6 +480,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         today = timezone.now()
         six_months_ago = today - datetime.timedelta(days=180)
 
+        # A plain range on created_at: uses the (manager, created_at) index and prunes to recent partitions
         monthly_trends_given_by_me = Feedback.objects.filter(manager=user, created_at__gte=six_months_ago) \
                                                     .annotate(month=TruncMonth('created_at')) \
                                                     .values('month') \
@@ -292,8 +558,9 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         # Comments (Basic implementation)
         p.drawString(1 * inch, height - 6 * inch, "Comments:")
         y_pos = height - 6.2 * inch
-        for comment in feedback.comments.all():
-            p.drawString(1 * inch, y_pos, f"   - {comment.author.username} ({comment.created_at.strftime('%Y-%m-%d')}): {comment.content}")
+        for comment in feedback.comments.select_related('author').order_by('created_at'):
+            body = html_to_text(comment.content_html) if comment.is_markdown else comment.content
+            p.drawString(1 * inch, y_pos, f"   - {comment.author.username} ({comment.created_at.strftime('%Y-%m-%d')}): {body}")
             y_pos -= 0.2 * inch
             if y_pos < 1 * inch:
                 p.showPage()
@@ -305,29 +572,32 @@ class FeedbackViewSet(viewsets.ModelViewSet):
 
 
 # --- NEW ViewSet: CommentViewSet ---
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(AtomicWritesMixin, ConditionalListMixin, DeltaSyncMixin, ChangedFieldsUpdateMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all().order_by('created_at')
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated, IsCommentAuthor]
+    tombstone_resource = 'comment'
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
     def get_queryset(self):
         feedback_id = self.request.query_params.get('feedback', None)
+        comments = Comment.objects.select_related('author')
         if feedback_id:
-            return Comment.objects.filter(feedback_id=feedback_id).order_by('created_at')
+            return comments.filter(feedback_id=feedback_id).order_by('created_at')
         user = self.request.user
         if user.is_superuser:
-            return Comment.objects.all().order_by('created_at')
-        return Comment.objects.filter(author=user).order_by('created_at')
+            return comments.all().order_by('created_at')
+        return comments.filter(author=user).order_by('created_at')
 
 
 # --- NEW ViewSet: FeedbackRequestViewSet ---
-class FeedbackRequestViewSet(viewsets.ModelViewSet):
+class FeedbackRequestViewSet(AtomicWritesMixin, ConditionalListMixin, DeltaSyncMixin, ChangedFieldsUpdateMixin, viewsets.ModelViewSet):
     queryset = FeedbackRequest.objects.all().order_by('-created_at')
     serializer_class = FeedbackRequestSerializer
     permission_classes = [permissions.IsAuthenticated, IsRequesterOrTargetManager]
+    tombstone_resource = 'feedbackrequest'
 
     def perform_create(self, serializer):
         if self.request.user.role != 'employee':
@@ -336,14 +606,15 @@ class FeedbackRequestViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        requests = FeedbackRequest.objects.select_related('requester', 'target_manager')
         if user.is_superuser:
-            return FeedbackRequest.objects.all().order_by('-created_at')
+            return requests.all().order_by('-created_at')
         elif user.role == 'manager':
-            return FeedbackRequest.objects.filter(
+            return requests.filter(
                 Q(target_manager=user) | Q(requester__manager=user)
             ).distinct().order_by('-created_at')
         elif user.role == 'employee':
-            return FeedbackRequest.objects.filter(requester=user).order_by('-created_at')
+            return requests.filter(requester=user).order_by('-created_at')
         return FeedbackRequest.objects.none()
 
     @action(detail=True, methods=['patch'], url_path='mark-fulfilled',
@@ -356,31 +627,91 @@ class FeedbackRequestViewSet(viewsets.ModelViewSet):
             return Response({"detail": "You do not have permission to mark this request as fulfilled."},
                             status=status.HTTP_403_FORBIDDEN)
 
-        if req_instance.is_fulfilled:
+        if not claim_flag(req_instance, 'is_fulfilled'):
             return Response({"detail": "Feedback request is already marked as fulfilled."}, status=status.HTTP_400_BAD_REQUEST)
 
-        req_instance.is_fulfilled = True
-        req_instance.save()
         serializer = self.get_serializer(req_instance)
         return Response(serializer.data)
 
 
 # --- NEW ViewSet: PeerFeedbackViewSet ---
-class PeerFeedbackViewSet(viewsets.ModelViewSet):
+class PeerFeedbackViewSet(AtomicWritesMixin, ConditionalListMixin, DeltaSyncMixin, ChangedFieldsUpdateMixin, viewsets.ModelViewSet):
     queryset = PeerFeedback.objects.all().order_by('-created_at')
     serializer_class = PeerFeedbackSerializer
     permission_classes = [permissions.IsAuthenticated, IsPeerFeedbackGiverOrReceiver]
+    tombstone_resource = 'peerfeedback'
 
     def perform_create(self, serializer):
         serializer.save(giver=self.request.user)
 
     def get_queryset(self):
         user = self.request.user
+        peer_feedback = PeerFeedback.objects.select_related('giver', 'receiver')
         if user.is_superuser:
-            return PeerFeedback.objects.all().order_by('-created_at')
+            return peer_feedback.all().order_by('-created_at')
         elif user.role == 'manager':
-            return PeerFeedback.objects.filter(
+            return peer_feedback.filter(
                 Q(giver=user) | Q(receiver=user) | Q(receiver__manager=user) | Q(giver__manager=user)
             ).distinct().order_by('-created_at')
         else: # Employee role
-            return PeerFeedback.objects.filter(Q(giver=user) | Q(receiver=user)).order_by('-created_at')
\ No newline at end of file
+            return peer_feedback.filter(Q(giver=user) | Q(receiver=user)).order_by('-created_at')
+
+
+# --- NEW ViewSets: Review cycles and their precomputed dossiers ---
+class ReviewCycleViewSet(AtomicWritesMixin, viewsets.ModelViewSet):
+    queryset = ReviewCycle.objects.all()
+    serializer_class = ReviewCycleSerializer
+    permission_classes = [permissions.IsAuthenticated, IsSuperuserOrReadOnly]
+
+    def perform_create(self, serializer):
+        cycle = serializer.save(created_by=self.request.user)
+        enqueue('review_cycle.build', id=cycle.id) # Built by `drain_outbox`, not on this request
+
+    def perform_update(self, serializer):
+        frozen_range_changed = {'starts_at', 'ends_at'} & serializer.validated_data.keys()
+        cycle = serializer.save(status='building') if frozen_range_changed else serializer.save()
+        if frozen_range_changed:
+            enqueue('review_cycle.build', id=cycle.id)
+
+    @action(detail=True, methods=['post'])
+    def rebuild(self, request, pk=None):
+        cycle = self.get_object()
+        cycle.status = 'building'
+        cycle.save(update_fields=['status'])
+        enqueue('review_cycle.build', id=cycle.id)
+        return Response(self.get_serializer(cycle).data, status=status.HTTP_202_ACCEPTED)
+
+
+class DossierViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Frozen per-employee review material. Employees see their own dossiers,
+    managers also see their reports'. Filter with `?cycle=<id>`. Cycles that
+    are still (re)building are hidden until every dossier is written.
+    """
+    serializer_class = DossierSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        dossiers = Dossier.objects.filter(cycle__status='ready').defer('pdf').order_by('cycle', 'employee')
+        cycle_id = self.request.query_params.get('cycle')
+        if cycle_id:
+            try:
+                dossiers = dossiers.filter(cycle_id=int(cycle_id))
+            except ValueError:
+                raise ValidationError({"cycle": "Expected a review cycle id."})
+        if user.is_superuser:
+            return dossiers
+        if user.role == 'manager':
+            return dossiers.filter(Q(employee=user) | Q(employee__manager=user))
+        return dossiers.filter(employee=user)
+
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        dossier = self.get_object()
+        if dossier.pdf is None:
+            return Response({"detail": "No PDF was built for this dossier (ReportLab not installed on the builder)."},
+                            status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponse(bytes(dossier.pdf), content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="dossier_{dossier.cycle_id}_{dossier.employee_id}.pdf"'
+        return response
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 from datetime import timedelta 
 
@@ -50,7 +51,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'feedback_app.middleware.RequestMetricsMiddleware', # Server-Timing + /metrics, outermost to time everything
+    'feedback_app.middleware.CompressionMiddleware', # brotli/gzip, must wrap everything that edits content
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'feedback_app.middleware.ReplicaRoutingMiddleware', # After sessions, so session users can be pinned
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
     'django.middleware.common.CommonMiddleware',
@@ -95,6 +99,23 @@ DATABASES = {
     }
 }
 
+# --- Read replicas ---
+# POSTGRES_REPLICA_HOSTS is a comma-separated list of streaming replicas sharing the
+# primary's credentials. Safe-method requests read from them (feedback_app/routers.py);
+# a user who just wrote stays on the primary for REPLICA_STICKINESS_SECONDS.
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(h.strip() for h in os.environ.get('POSTGRES_REPLICA_HOSTS', '').split(',') if h.strip()):
+    _alias = f'replica_{_index + 1}'
+    DATABASES[_alias] = {
+        **DATABASES['default'],
+        'HOST': _host,
+        'PORT': os.environ.get('POSTGRES_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(_alias)
+DATABASE_ROUTERS = ['feedback_app.routers.ReplicaRouter']
+REPLICA_STICKINESS_SECONDS = int(os.environ.get('REPLICA_STICKINESS_SECONDS', 5))
+
 # --- DEBUGGING PRINTS FOR DATABASE SETTINGS (REMOVE IN PRODUCTION) ---
 print(f"DEBUG: DB_NAME: {DATABASES['default']['NAME']}")
 print(f"DEBUG: DB_USER: {DATABASES['default']['USER']}")
@@ -122,6 +143,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing. PASSWORD_HASHER=argon2 prefers Argon2 (needs argon2-cffi);
+# existing hashes keep working and are upgraded on each user's next login.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 0)) # 0: Django's default
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 19456)) # KiB
+PASSWORD_ARGON2_PARALLELISM = int(os.environ.get('PASSWORD_ARGON2_PARALLELISM', 1))
+
+PASSWORD_HASHERS = [
+    'feedback_app.hashers.TunablePBKDF2PasswordHasher',
+    'feedback_app.hashers.TunableArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if PASSWORD_HASHER == 'argon2':
+    if importlib.util.find_spec('argon2') is not None:
+        PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+    else:
+        print("argon2-cffi not installed. Falling back to PBKDF2 password hashing.")
+
 
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:5173", # Your frontend's development URL
@@ -164,12 +205,71 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated', # Default to requiring authentication for all views
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'feedback_app.metrics.InstrumentedJSONRenderer', # JSONRenderer that reports render time
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_THROTTLE_CLASSES': (
+        'feedback_app.throttling.CostClassThrottle', # Token buckets per user and endpoint cost class
+    ),
 }
 
+# --- Delta sync ---
+# Sync tokens are backdated by this much: the longest a write transaction (one request) can stay open.
+DELTA_SYNC_OVERLAP_SECONDS = 60
+# Tombstones older than this are purged by `drain_outbox`; older sync tokens get a full resync (reset: true)
+TOMBSTONE_RETENTION_DAYS = int(os.environ.get('TOMBSTONE_RETENTION_DAYS', 30))
+
+# --- Throttling buckets ---
+# Each request spends `cost` tokens; a bucket holds `capacity` and refills at capacity/period per second.
+THROTTLE_BUCKETS = {
+    'default': {'capacity': 600, 'period': 60, 'cost': 1},
+    'summary': {'capacity': 60, 'period': 60, 'cost': 5},  # manager-summary: 12/min
+    'pdf': {'capacity': 60, 'period': 60, 'cost': 10},     # export-pdf: 6/min
+}
+
+# --- Request metrics ---
+# Requests running more SQL queries than this log a warning.
+REQUEST_QUERY_BUDGET = int(os.environ.get('REQUEST_QUERY_BUDGET', 50))
+# /metrics requires "Authorization: Bearer <METRICS_TOKEN>", and answers 403 while it is unset.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# --- Cache ---
+# Throttle buckets and token revocations are stored here. Set REDIS_URL so every worker shares them;
+# without it, token refresh falls back to a user lookup per request (see tokens.py).
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# --- Real-time notifications ---
+# 'local' fans events out inside a single ASGI worker; 'postgres' relays them
+# through LISTEN/NOTIFY so streams on every worker receive them.
+NOTIFICATIONS_BACKEND = os.environ.get('NOTIFICATIONS_BACKEND', 'local')
+NOTIFICATIONS_CHANNEL = 'growthflow_events'
+
+# --- Transactional outbox (drained by `manage.py drain_outbox`) ---
+OUTBOX_LEASE_SECONDS = 60 # A claimed event is retried by another worker after this
+OUTBOX_MAX_ATTEMPTS = 5
+OUTBOX_RETRY_BACKOFF_SECONDS = 5 # Doubles after each failed attempt
+
+# --- Org import ---
+# Larger files go through `manage.py import_org`, which doesn't hold a request worker while hashing
+ORG_IMPORT_SYNC_MAX_ROWS = int(os.environ.get('ORG_IMPORT_SYNC_MAX_ROWS', 2000))
+
 
 SIMPLE_JWT = {
-    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5), 
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.environ.get('ACCESS_TOKEN_LIFETIME_MINUTES', 5))),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1), 
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
@@ -188,6 +288,8 @@ SIMPLE_JWT = {
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
     'USER_AUTHENTICATION_RULE': 'rest_framework_simplejwt.authentication.default_user_authentication_rule',
+    # Refresh checks the signature and a cache-based revocation list, not the user row
+    'TOKEN_REFRESH_SERIALIZER': 'feedback_app.serializers.StatelessTokenRefreshSerializer',
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
@@ -6,6 +6,7 @@ from rest_framework_simplejwt.views import TokenRefreshView # Keep this one
 
 
 from feedback_app.views import MyTokenObtainPairView # <--- Correct import
+from feedback_app.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,4 +14,5 @@ urlpatterns = [
    
     path('api/token/', MyTokenObtainPairView.as_view(), name='token_obtain_pair'), # <--- Use the custom view here
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('metrics', metrics_view, name='metrics'), # Prometheus scrape endpoint
 ]
\ No newline at end of file